@@ -0,0 +1,230 @@
+import logging
+import os
+import time
+from typing import TYPE_CHECKING
+
+from PyQt6.QtCore import QObject, QUrl, pyqtSignal
+
+from .loudness import effective_volume
+
+if TYPE_CHECKING:
+    from .sound_cache import PcmCache
+
+logger = logging.getLogger(__name__)
+
+
+class AlarmPlayer(QObject):
+    """
+    预加载的铃声播放器
+
+    选定的铃声在设置应用时提前载入：WAV 交给 QSoundEffect 解码到内存；
+    压缩格式先由 PcmCache 解码为 WAV，解码完成前（或 QSoundEffect 无法解码时）
+    由已设置好源的 QMediaPlayer 播放。
+    响铃时只调用 play()，不再重新打开和解码文件。
+    每次播放从 play() 到实际开始播放的毫秒数通过 latency_measured 发出。
+    实际音量为 音量设置 × 铃声的响度归一化增益（增益不大于 1，只衰减偏响的铃声）。
+
+    QtMultimedia 与音频后端在 warm_up()（窗口显示后的空闲回调）中才导入和创建，
+    之前的 preload() 只记录铃声路径；warm_up() 之前就需要播放时同步创建。
+    """
+
+    latency_measured = pyqtSignal(str, float)  # 文件路径, 毫秒
+
+    def __init__(self, cache: "PcmCache | None" = None, parent=None):
+        super().__init__(parent)
+        self._volume = 0.8
+        self._gain = 1.0
+        self._source: str | None = None
+        self._stamp = None
+        self._loaded: str | None = None  # 实际载入的文件（压缩铃声为缓存的 WAV）
+        self._pending_load: str | None = None
+        self._use_effect = False
+        self._warming = False
+        self._cache = cache
+        if cache is not None:
+            cache.ready.connect(self._on_cached)
+        self._effect = None
+        self.audio_output = None
+        self.media_player = None
+        # QtMultimedia 的枚举值，创建后端时填入
+        self._playing_state = None
+        self._effect_error = None
+        self._effect_ready = None
+        self._requested_at: float | None = None
+        self.last_latency_ms: float | None = None
+
+    @property
+    def source(self) -> str | None:
+        return self._source
+
+    @property
+    def backend_ready(self) -> bool:
+        return self._effect is not None
+
+    def _ensure_backend(self) -> None:
+        if self._effect is not None:
+            return
+        started = time.perf_counter()
+        from PyQt6.QtMultimedia import QAudioOutput, QMediaPlayer, QSoundEffect
+
+        self._playing_state = QMediaPlayer.PlaybackState.PlayingState
+        self._effect_error = QSoundEffect.Status.Error
+        self._effect_ready = QSoundEffect.Status.Ready
+        self._effect = QSoundEffect(self)
+        self._effect.statusChanged.connect(self._on_effect_status)
+        self._effect.playingChanged.connect(self._on_effect_playing)
+        self.audio_output = QAudioOutput(self)
+        self._apply_volume()
+        self.media_player = QMediaPlayer(self)
+        self.media_player.setAudioOutput(self.audio_output)
+        self.media_player.playbackStateChanged.connect(self._on_player_state)
+        logger.debug("audio backend created in %.1f ms", (time.perf_counter() - started) * 1000)
+        if self._source:
+            self._load_source()
+
+    def warm_up(self) -> None:
+        """
+        创建音频后端并载入当前铃声
+
+        铃声载入完成后静音播放一次再停止，提前打开音频设备，第一次响铃的延迟与之后相同。
+        """
+        self._ensure_backend()
+        if self._use_effect and self._source:
+            self._warming = True
+            self._on_effect_status()
+
+    def _apply_volume(self) -> None:
+        if self._effect is not None:
+            volume = effective_volume(self._volume, self._gain)
+            self._effect.setVolume(volume)
+            self.audio_output.setVolume(volume)
+
+    def set_volume(self, volume: float) -> None:
+        self._volume = max(0.0, min(1.0, volume))
+        self._apply_volume()
+
+    def set_gain(self, gain: float) -> None:
+        """当前铃声的响度归一化增益"""
+        gain = max(0.0, min(1.0, gain))
+        if gain != self._gain:
+            self._gain = gain
+            self._apply_volume()
+
+    def preload(self, path: str | None, stamp=None, gain: float = 1.0) -> None:
+        """
+        提前载入铃声
+
+        stamp（如文件修改时间）与上次相同且路径不变时不重新载入。
+        """
+        self.set_gain(gain)
+        if not path:
+            self._source = None
+            self._stamp = None
+            return
+        if path == self._source and stamp == self._stamp:
+            return
+        self.stop()
+        self._source = path
+        self._stamp = stamp
+        if self._effect is not None:
+            self._load_source()
+
+    def _load_source(self) -> None:
+        target = self._source
+        if self._cache is not None and self._cache.needs_decode(target):
+            # 未缓存时先用 QMediaPlayer 播放原文件，解码完成后由 _on_cached 切换
+            target = self._cache.request(target) or target
+        self._load(target)
+
+    def _load(self, path: str) -> None:
+        self._loaded = path
+        self._pending_load = None
+        url = QUrl.fromLocalFile(path)
+        self._use_effect = os.path.splitext(path)[1].lower() == '.wav'
+        if self._use_effect:
+            self._effect.setSource(url)
+            self.media_player.setSource(QUrl())
+        else:
+            self._effect.setSource(QUrl())
+            self.media_player.setSource(url)
+        logger.debug("alarm preloaded (%s): %s", "sound effect" if self._use_effect else "media player", path)
+
+    def _on_cached(self, source: str, cached: str) -> None:
+        if source != self._source or cached == self._loaded or self._effect is None:
+            return
+        if self.media_player.playbackState() == self._playing_state:
+            # 不打断正在播放的铃声，下一次播放前再切换
+            self._pending_load = cached
+        else:
+            self._load(cached)
+
+    def _on_effect_status(self) -> None:
+        status = self._effect.status()
+        if status == self._effect_error and self._use_effect and self._loaded:
+            # QSoundEffect 只支持 PCM WAV，其余编码交给 QMediaPlayer
+            logger.debug("sound effect cannot decode %s, using media player", self._loaded)
+            self._warming = False
+            self._use_effect = False
+            self.media_player.setSource(QUrl.fromLocalFile(self._loaded))
+            if self._requested_at is not None:
+                self.media_player.play()
+        elif status == self._effect_ready and self._warming and self._requested_at is None:
+            self._effect.setMuted(True)
+            self._effect.play()
+
+    def _finish_warm_up(self) -> None:
+        self._warming = False
+        if self._effect.isPlaying():
+            self._effect.stop()
+        self._effect.setMuted(False)
+        logger.debug("audio device warmed up")
+
+    def play(self, path: str | None = None, gain: float | None = None) -> None:
+        """播放铃声；path 与已载入的不同时先载入（试听其他文件）"""
+        self._ensure_backend()
+        if path and path != self._source:
+            self.preload(path, gain=1.0 if gain is None else gain)
+        elif gain is not None:
+            self.set_gain(gain)
+        if not self._source:
+            return
+        self.stop()
+        if self._pending_load is not None:
+            self._load(self._pending_load)
+        self._requested_at = time.perf_counter()
+        if self._use_effect:
+            # 仍在载入时 QSoundEffect 会在载入完成后开始播放
+            self._effect.play()
+        else:
+            self.media_player.play()
+
+    def stop(self) -> None:
+        self._requested_at = None
+        if self._effect is None:
+            return
+        if self._warming:
+            self._finish_warm_up()
+        if self._effect.isPlaying():
+            self._effect.stop()
+        if self.media_player.playbackState() == self._playing_state:
+            self.media_player.stop()
+
+    def _record_latency(self) -> None:
+        if self._requested_at is None:
+            return
+        self.last_latency_ms = (time.perf_counter() - self._requested_at) * 1000
+        self._requested_at = None
+        logger.debug("alarm latency %.1f ms: %s", self.last_latency_ms, self._source)
+        self.latency_measured.emit(self._source or "", self.last_latency_ms)
+
+    def _on_effect_playing(self) -> None:
+        if not self._effect.isPlaying():
+            return
+        if self._warming and self._requested_at is None:
+            self._finish_warm_up()
+            return
+        self._record_latency()
+
+    def _on_player_state(self, state) -> None:
+        if state == self._playing_state:
+            self._record_latency()
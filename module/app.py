@@ -1,4 +1,3 @@
-import json
 import logging
 import os
 import sys
@@ -6,7 +5,7 @@ import sys
 from PyQt6.QtCore import QLocale, QTranslator
 from PyQt6.QtWidgets import QApplication
 
-from .paths import get_base_path
+from .settings_store import get_settings_repository
 from .timer_window import TimerWindow
 
 
@@ -18,14 +17,8 @@ def _configure_logging():
     )
 
 def _load_language_setting() -> str:
-    try:
-        base_path = get_base_path()
-        settings_path = os.path.join(base_path, "settings", "timer_settings.json")
-        with open(settings_path, 'r', encoding='utf-8') as f:
-            settings = json.load(f)
-        return settings.get('language', 'zh_CN')
-    except Exception:
-        return 'zh_CN'
+    # 与 TimerWindow 共享同一次解析结果
+    return get_settings_repository().language()
 
 
 def main():
@@ -0,0 +1,56 @@
+from typing import Callable, Mapping
+
+from PyQt6.QtCore import QDateTime
+
+ClockFormatter = Callable[[QDateTime], str]
+
+# 时钟模式相关设置及其默认值；任一变化时才需要重新编译格式化器
+CLOCK_SETTING_DEFAULTS = {
+    "clock_show_date": False,
+    "clock_format_24h": True,
+    "clock_show_seconds": True,
+    "clock_show_am_pm": True,
+    "clock_am_pm_style": "zh",
+    "clock_am_pm_position": "before",
+}
+
+
+def clock_settings_key(settings: Mapping) -> tuple:
+    """提取时钟相关设置，作为格式化器缓存的比较键"""
+    return tuple(settings.get(key, default) for key, default in CLOCK_SETTING_DEFAULTS.items())
+
+
+def _quote(text: str) -> str:
+    """转义为 QDateTime.toString 格式串中的字面文本"""
+    return "'" + text.replace("'", "''") + "'"
+
+
+def compile_clock_formatter(settings: Mapping) -> ClockFormatter:
+    """
+    将时钟设置编译为单个格式化函数
+
+    所有分支在编译时确定，每次刷新只剩一次 toString 调用；
+    12 小时制带 AM/PM 时预先生成上午/下午两个格式串，按小时选择。
+    """
+    show_date, format_24h, show_seconds, show_am_pm, am_pm_style, am_pm_position = clock_settings_key(settings)
+
+    time_fmt = "mm:ss" if show_seconds else "mm"
+    time_fmt = ("HH:" if format_24h else "hh:") + time_fmt
+    date_fmt = "yyyy-MM-dd " if show_date else ""
+
+    if format_24h or not show_am_pm:
+        fmt = date_fmt + time_fmt
+        return lambda current_time: current_time.toString(fmt)
+
+    am_text, pm_text = ("AM", "PM") if am_pm_style == "en" else ("上午", "下午")
+    if am_pm_position == "before":
+        am_fmt = f"{date_fmt}{_quote(am_text)} {time_fmt}"
+        pm_fmt = f"{date_fmt}{_quote(pm_text)} {time_fmt}"
+    else:
+        am_fmt = f"{date_fmt}{time_fmt} {_quote(am_text)}"
+        pm_fmt = f"{date_fmt}{time_fmt} {_quote(pm_text)}"
+
+    def _format(current_time: QDateTime) -> str:
+        return current_time.toString(pm_fmt if current_time.time().hour() >= 12 else am_fmt)
+
+    return _format
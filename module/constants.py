@@ -7,6 +7,9 @@ DEFAULT_SHORTCUTS = {
     'toggle_fullscreen': 'F11',
 }
 
+# 设置中缺少倒计时时长时的默认值（25 分钟）
+DEFAULT_COUNTDOWN_TIME = {"countdown_hours": 0, "countdown_minutes": 25, "countdown_seconds": 0}
+
 DEFAULT_COUNTDOWN_PRESETS = [
     {"id": "builtin_pomodoro", "name_key": "pomodoro", "mode": "countdown", "hours": 0, "minutes": 25, "seconds": 0},
     {"id": "builtin_short_break", "name_key": "short_break", "mode": "countdown", "hours": 0, "minutes": 5, "seconds": 0},
@@ -29,15 +32,24 @@ class TimerConstants:
     """计时器常量配置"""
 
     # 计时器刷新（毫秒）
-    TIMER_UPDATE_INTERVAL = 1000
     FLASH_INTERVAL = 500
 
-    # 闪烁次数
+    # 刷新按整秒/整分边界对齐，额外延后的余量（毫秒），确保触发时已越过边界
+    TICK_SLACK_MS = 2
+
+    # 闪烁次数（状态切换次数，3 次闪烁 = 6 次切换）
     FLASH_COUNT_MAX = 6
 
+    # 自定义闪烁节奏的上限：最多步数、单步最长毫秒数
+    FLASH_PATTERN_MAX_STEPS = 200
+    FLASH_STEP_MAX_MS = 10000
+
     # 通知持续时间（秒）
     NOTIFICATION_DURATION_SHORT = 3
     NOTIFICATION_DURATION_LONG = 5
 
     # 托盘消息持续时间（毫秒）
     TRAY_MESSAGE_DURATION = 1000
+
+    # 窗口首次显示后，延迟多久在空闲时创建音频后端并预热音频设备（毫秒）
+    AUDIO_WARMUP_DELAY_MS = 300
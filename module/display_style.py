@@ -0,0 +1,73 @@
+from functools import lru_cache
+from typing import NamedTuple
+
+from .timer_face import FaceStyle
+
+FLASH_TEXT_COLOR = "red"
+
+
+class DisplayStyles(NamedTuple):
+    """时间显示的常规/闪烁提醒两套样式（QLabel 为样式表字符串，绘制式表盘为 FaceStyle）"""
+
+    normal: str | FaceStyle
+    alert: str | FaceStyle
+
+
+def hex_to_rgb(hex_color: str) -> tuple[int, int, int]:
+    """将十六进制颜色转换为RGB"""
+    hex_color = hex_color.lstrip('#')
+    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+
+
+def adjust_brightness(hex_color: str, factor: float) -> str:
+    """调整颜色亮度"""
+    rgb = hex_to_rgb(hex_color)
+    adjusted = tuple(int(c * factor) for c in rgb)
+    return f'#{adjusted[0]:02x}{adjusted[1]:02x}{adjusted[2]:02x}'
+
+
+def _label_stylesheet(text_color, bg_rgb, bg_opacity, corner_radius, padding) -> str:
+    """生成时间标签样式表"""
+    return f"""
+            QLabel {{
+                color: {text_color};
+                background-color: rgba({bg_rgb[0]}, {bg_rgb[1]}, {bg_rgb[2]}, {bg_opacity});
+                border-radius: {corner_radius}px;
+                padding: {padding[0]}px {padding[1]}px;
+            }}
+        """
+
+
+@lru_cache(maxsize=32)
+def compile_display_styles(
+    text_color: str,
+    bg_color: str,
+    bg_opacity: int,
+    night_mode: bool,
+    corner_radius: int,
+    fullscreen: bool,
+    painted: bool,
+) -> DisplayStyles:
+    """
+    将外观设置编译为两套显示样式
+
+    结果按参数缓存，相同外观重复应用（全屏切换往返、闪烁、重新打开设置）时返回同一对象，
+    调用方可据此跳过 setStyleSheet。corner_radius 为最终圆角（未开启圆角时传 0）。
+    """
+    # 夜读模式：降低亮度
+    if night_mode:
+        text_color = adjust_brightness(text_color, 0.6)
+        bg_opacity = min(bg_opacity, 150)
+    if fullscreen:
+        bg_opacity = 255
+        corner_radius = 0
+    bg_rgb = hex_to_rgb(bg_color)
+    padding = (0, 0) if fullscreen else (30, 60)
+
+    if painted:
+        normal = FaceStyle(text_color, (*bg_rgb, bg_opacity), corner_radius, padding)
+        return DisplayStyles(normal, normal._replace(text_color=FLASH_TEXT_COLOR))
+    return DisplayStyles(
+        _label_stylesheet(text_color, bg_rgb, bg_opacity, corner_radius, padding),
+        _label_stylesheet(FLASH_TEXT_COLOR, bg_rgb, bg_opacity, corner_radius, padding),
+    )
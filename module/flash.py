@@ -0,0 +1,68 @@
+from typing import Any, Callable, Sequence
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+
+class FlashRenderer(QObject):
+    """
+    倒计时结束的闪烁提醒
+
+    在常规/提醒两套预先生成的样式之间切换，每一步只调用一次样式应用函数
+    （QLabel 为 setStyleSheet，绘制式表盘为 set_face_style），不再触发完整的 apply_settings。
+    """
+
+    finished = pyqtSignal()
+
+    def __init__(self, parent: QObject | None = None):
+        super().__init__(parent)
+        self._apply_style: Callable[[Any], None] = lambda _style: None
+        self._normal_style: Any = None
+        self._alert_style: Any = None
+        self._pattern: tuple[int, ...] = ()
+        self._step_index = -1
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._advance)
+
+    @property
+    def active(self) -> bool:
+        return self._step_index >= 0
+
+    def set_styles(self, normal: Any, alert: Any, apply_style: Callable[[Any], None]) -> None:
+        """更新两套样式及其应用函数，并立即应用当前状态对应的一套"""
+        self._normal_style = normal
+        self._alert_style = alert
+        self._apply_style = apply_style
+        apply_style(alert if self._showing_alert() else normal)
+
+    def start(self, pattern: Sequence[int]) -> None:
+        """
+        开始闪烁
+
+        Args:
+            pattern: 每一步的持续毫秒数，偶数步显示提醒样式，奇数步恢复常规样式
+        """
+        self._pattern = tuple(int(ms) for ms in pattern if int(ms) > 0)
+        if not self._pattern:
+            return
+        self._step_index = -1
+        self._advance()
+
+    def stop(self) -> None:
+        if not self.active:
+            return
+        self._timer.stop()
+        self._step_index = -1
+        self._apply_style(self._normal_style)
+
+    def _showing_alert(self) -> bool:
+        return self._step_index >= 0 and self._step_index % 2 == 0
+
+    def _advance(self) -> None:
+        self._step_index += 1
+        if self._step_index >= len(self._pattern):
+            self.stop()
+            self.finished.emit()
+            return
+        self._apply_style(self._alert_style if self._showing_alert() else self._normal_style)
+        self._timer.start(self._pattern[self._step_index])
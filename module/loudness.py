@@ -0,0 +1,98 @@
+import array
+import logging
+import math
+import sys
+import wave
+
+logger = logging.getLogger(__name__)
+
+# 归一化目标：RMS 响度（dBFS）。
+# 播放音量上限为 1.0，增益只能衰减：比目标响的文件降到目标，更安静的保持原样。
+# 目标取自带铃声中最安静的一个（Alarm07，约 -32 dBFS），自带的 Alarm01 ~ Alarm10 因此都能对齐；
+# 固定目标而不是按文件调整 sound_volume，是为了让音量设置保持为用户可见、单调的最后一个乘数。
+TARGET_RMS_DB = -32.0
+# 最大衰减（-26 dB），RMS 高于约 -6 dBFS 的异常文件不再继续压低
+MIN_GAIN = 0.05
+
+_CHUNK_FRAMES = 65536
+_SILENCE_DB = -120.0
+# 8 位无符号样本翻转最高位即为有符号样本
+_UNSIGNED_TO_SIGNED = bytes(i ^ 0x80 for i in range(256))
+
+
+def _samples(data: bytes, sample_width: int) -> tuple[array.array, int]:
+    """把一段 PCM 数据转换为整数数组，返回 (样本, 满量程)"""
+    if sample_width == 1:
+        # 8 位 WAV 为无符号样本，减去中点后与其他位宽一致
+        return array.array('b', data.translate(_UNSIGNED_TO_SIGNED)), 128
+    if sample_width == 2:
+        samples = array.array('h', data)
+        scale = 32768
+    elif sample_width == 3:
+        # 24 位只取高 16 位，按切片整体重排而不是逐个样本转换
+        packed = bytearray(len(data) // 3 * 2)
+        packed[0::2] = data[1::3]
+        packed[1::2] = data[2::3]
+        samples = array.array('h', bytes(packed))
+        scale = 32768
+    elif sample_width == 4:
+        samples = array.array('i', data)
+        scale = 2147483648
+    else:
+        raise ValueError(f"unsupported sample width: {sample_width}")
+    if sys.byteorder != 'little':
+        samples.byteswap()
+    return samples, scale
+
+
+def _to_db(value: float) -> float:
+    return 20 * math.log10(value) if value > 0 else _SILENCE_DB
+
+
+def analyze_wav(path: str) -> tuple[float, float] | None:
+    """
+    计算 PCM WAV 的 RMS 与峰值响度（dBFS）
+
+    按块读取，平方和用 math.sumprod（Python 3.12+）在 C 层对整个数组求值；无法读取时返回 None。
+    """
+    try:
+        with wave.open(path, 'rb') as wav:
+            sample_width = wav.getsampwidth()
+            total = 0
+            count = 0
+            peak = 0
+            scale = 1
+            while True:
+                data = wav.readframes(_CHUNK_FRAMES)
+                if not data:
+                    break
+                samples, scale = _samples(data, sample_width)
+                if not samples:
+                    continue
+                total += math.sumprod(samples, samples)
+                count += len(samples)
+                peak = max(peak, max(samples), -min(samples))
+    except (OSError, EOFError, ValueError, wave.Error) as e:
+        logger.debug("Failed to analyze %s: %s", path, e)
+        return None
+    if not count:
+        return None
+    rms = math.sqrt(total / count) / scale
+    return _to_db(rms), _to_db(min(1.0, peak / scale))
+
+
+def loudness_gain(rms_db: float | None) -> float:
+    """使 RMS 不超过 TARGET_RMS_DB 的线性增益，范围 MIN_GAIN ~ 1.0（只衰减，不会削波）"""
+    if rms_db is None or rms_db <= _SILENCE_DB:
+        return 1.0
+    gain_db = min(0.0, TARGET_RMS_DB - rms_db)
+    return max(MIN_GAIN, 10 ** (gain_db / 20))
+
+
+def effective_volume(volume: float, gain: float) -> float:
+    """
+    实际播放音量：音量设置 × 响度增益
+
+    增益不大于 1，乘积不会超过 1.0 被截断，音量设置越大实际音量越大。
+    """
+    return max(0.0, min(1.0, volume)) * max(0.0, min(1.0, gain))
@@ -0,0 +1,213 @@
+import uuid
+from typing import Any, Callable, Iterable
+
+from .constants import DEFAULT_COUNTDOWN_PRESETS
+
+
+def _clamp_int(value, min_value, max_value):
+    try:
+        ivalue = int(value)
+    except (TypeError, ValueError):
+        ivalue = min_value
+    return max(min_value, min(max_value, ivalue))
+
+
+def clean_labels(raw_labels) -> dict[str, str]:
+    """只保留 语言代码 -> 非空文本 的标签项"""
+    labels = {}
+    if isinstance(raw_labels, dict):
+        for lang_code, text in raw_labels.items():
+            if not isinstance(lang_code, str):
+                continue
+            if isinstance(text, str):
+                stripped = text.strip()
+                if stripped:
+                    labels[lang_code] = stripped
+    return labels
+
+
+def default_presets() -> list[dict[str, Any]]:
+    return [dict(preset) for preset in DEFAULT_COUNTDOWN_PRESETS]
+
+
+def normalize_preset(entry, seen_ids: set[str], current_lang: str) -> tuple[dict[str, Any] | None, bool]:
+    """
+    校验并规范化单个预设
+
+    Returns:
+        (规范化后的预设，非字典时为 None; id 是否被修正)
+    """
+    if not isinstance(entry, dict):
+        return None, True
+    changed = False
+
+    preset_id = entry.get('id')
+    if not isinstance(preset_id, str) or not preset_id.strip():
+        preset_id = f"preset_{uuid.uuid4().hex[:8]}"
+        changed = True
+    if preset_id in seen_ids:
+        preset_id = f"{preset_id}_{uuid.uuid4().hex[:4]}"
+        changed = True
+    seen_ids.add(preset_id)
+
+    hours = _clamp_int(entry.get('hours', 0), 0, 99)
+    minutes = _clamp_int(entry.get('minutes', 0), 0, 59)
+    seconds = _clamp_int(entry.get('seconds', 0), 0, 59)
+
+    labels = clean_labels(entry.get('labels'))
+
+    name_key = entry.get('name_key')
+    if isinstance(name_key, str):
+        name_key = name_key.strip()
+    else:
+        name_key = None
+
+    single_label = entry.get('label')
+    if isinstance(single_label, str) and single_label.strip():
+        stripped = single_label.strip()
+        labels.setdefault(current_lang, stripped)
+
+    label_value = labels.get(current_lang)
+    if not label_value and labels:
+        # fallback to any existing label
+        label_value = next(iter(labels.values()))
+
+    return {
+        'id': preset_id,
+        'mode': 'countdown',
+        'hours': hours,
+        'minutes': minutes,
+        'seconds': seconds,
+        **({'label': label_value} if label_value else {}),
+        **({'labels': labels} if labels else {}),
+        **({'name_key': name_key} if name_key else {}),
+    }, changed
+
+
+def normalize_presets(presets, current_lang: str) -> tuple[list[dict[str, Any]], bool]:
+    """确保倒计时预设结构合法（整体校验，用于加载与导入）"""
+    source = presets if isinstance(presets, list) else []
+    normalized = []
+    changed = False
+
+    if not source:
+        source = default_presets()
+        changed = True
+
+    seen_ids: set[str] = set()
+    for entry in source:
+        preset, entry_changed = normalize_preset(entry, seen_ids, current_lang)
+        changed = changed or entry_changed
+        if preset is not None:
+            normalized.append(preset)
+
+    if not normalized:
+        normalized = default_presets()
+        changed = True
+
+    return normalized, changed
+
+
+class PresetCollection:
+    """
+    已规范化、已校验的倒计时预设集合
+
+    每个条目带有修订号，条目被重新校验（新增或编辑）时递增；
+    update() 只校验调用方标记为改动过的条目，其余条目直接复用已校验的对象。
+    dirty 表示自上次 take_dirty() 以来集合有变化，需要写入预设库。
+    显示文本按 (预设 id, 修订号, 语言) 缓存，条目被编辑后修订号变化，旧缓存自然失效。
+    """
+
+    def __init__(self):
+        self._entries: list[dict[str, Any]] = []
+        self._by_id: dict[str, dict[str, Any]] = {}
+        self._revisions: dict[str, int] = {}
+        self._texts: dict[tuple[str, int, str], tuple[str, str]] = {}
+        self.dirty = False
+
+    def entries(self) -> list[dict[str, Any]]:
+        """当前预设列表（每次变化都会换成新的列表对象，调用方不应原地修改）"""
+        return self._entries
+
+    def revision(self, preset_id: str) -> int:
+        return self._revisions.get(preset_id, 0)
+
+    def revisions(self) -> dict[str, int]:
+        return self._revisions
+
+    def display_text(
+        self,
+        preset: dict[str, Any],
+        lang_code: str,
+        resolve: Callable[[dict[str, Any]], tuple[str, str]],
+    ) -> tuple[str, str]:
+        """预设的 (显示名称, 时长文本)；只在缓存未命中时调用 resolve(preset)"""
+        preset_id = preset.get('id')
+        key = (preset_id, self._revisions.get(preset_id, 0), lang_code)
+        text = self._texts.get(key)
+        if text is None:
+            text = self._texts[key] = resolve(preset)
+        return text
+
+    def invalidate_texts(self) -> None:
+        """切换语言后丢弃全部显示文本缓存"""
+        self._texts.clear()
+
+    def adopt(self, presets: list[dict[str, Any]]) -> None:
+        """接收已校验过的预设（从预设库读取），不重新校验"""
+        self._set_entries(list(presets), touched={p['id'] for p in presets})
+        self.dirty = False
+
+    def reset(self, presets, current_lang: str) -> bool:
+        """整体重新校验（导入、迁移或来源不明的列表）；返回规范化是否修正了内容"""
+        normalized, changed = normalize_presets(presets, current_lang)
+        self._set_entries(normalized, touched={p['id'] for p in normalized})
+        return changed
+
+    def update(self, presets: Iterable[dict[str, Any]], touched_ids: Iterable[str], current_lang: str) -> bool:
+        """
+        按新的顺序更新集合
+
+        id 已存在且不在 touched_ids 中的条目视为未修改，直接复用已校验的对象；
+        其余条目（新增或编辑过的）逐个校验并递增修订号。返回集合是否有变化。
+        """
+        touched = set(touched_ids)
+        seen_ids: set[str] = set()
+        entries = []
+        revalidated = set()
+        for entry in presets:
+            preset_id = entry.get('id') if isinstance(entry, dict) else None
+            existing = self._by_id.get(preset_id) if isinstance(preset_id, str) else None
+            if existing is not None and preset_id not in touched and preset_id not in seen_ids:
+                seen_ids.add(preset_id)
+                entries.append(existing)
+                continue
+            preset, _changed = normalize_preset(entry, seen_ids, current_lang)
+            if preset is not None:
+                entries.append(preset)
+                revalidated.add(preset['id'])
+        if not entries:
+            entries = default_presets()
+            revalidated = {p['id'] for p in entries}
+        if not revalidated and [p['id'] for p in entries] == [p['id'] for p in self._entries]:
+            return False
+        self._set_entries(entries, revalidated)
+        return True
+
+    def _set_entries(self, entries: list[dict[str, Any]], touched: set[str]) -> None:
+        by_id = {entry['id']: entry for entry in entries}
+        self._revisions = {
+            preset_id: self._revisions.get(preset_id, 0) + (1 if preset_id in touched else 0)
+            for preset_id in by_id
+        }
+        self._entries = entries
+        self._by_id = by_id
+        if self._texts:
+            # 丢弃已删除或已重新校验的条目的显示文本
+            revisions = self._revisions
+            self._texts = {key: text for key, text in self._texts.items() if revisions.get(key[0]) == key[1]}
+        self.dirty = True
+
+    def take_dirty(self) -> bool:
+        dirty, self.dirty = self.dirty, False
+        return dirty
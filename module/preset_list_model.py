@@ -0,0 +1,236 @@
+from typing import Any, Callable
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, QSortFilterProxyModel, Qt
+from PyQt6.QtGui import QFont
+
+from .preset_search import PresetSearchIndex
+
+# 返回 (显示名称, 列表摘要)
+PresetTextFn = Callable[[dict[str, Any]], tuple[str, str]]
+# 返回搜索索引的检索文本（按重要程度排列）
+PresetTermsFn = Callable[[dict[str, Any]], list[str]]
+
+
+def _total_seconds(preset: dict[str, Any]) -> int:
+    return (
+        max(0, int(preset.get("hours", 0))) * 3600
+        + max(0, int(preset.get("minutes", 0))) * 60
+        + max(0, int(preset.get("seconds", 0)))
+    )
+
+
+class PresetListModel(QAbstractListModel):
+    """
+    设置对话框预设页的列表模型
+
+    持有对话框中正在编辑的预设列表，并为每一行缓存摘要文本、小写名称与总秒数，
+    同时维护搜索索引；只有增删改的行会重新计算，搜索和排序不再逐行格式化。
+    """
+
+    IdRole = Qt.ItemDataRole.UserRole
+
+    def __init__(self, presets: list[dict[str, Any]], text_fn: PresetTextFn, terms_fn: PresetTermsFn, parent=None):
+        super().__init__(parent)
+        self._text_fn = text_fn
+        self._terms_fn = terms_fn
+        self._index = PresetSearchIndex()
+        self._presets: list[dict[str, Any]] = []
+        self._summaries: list[str] = []
+        self._name_keys: list[str] = []
+        self._seconds: list[int] = []
+        self.reset_presets(presets)
+
+    def _cache_row(self, preset: dict[str, Any]) -> tuple[str, str, int]:
+        label, summary = self._text_fn(preset)
+        self._index.add(preset.get('id'), self._terms_fn(preset))
+        return summary, label.lower(), _total_seconds(preset)
+
+    def reset_presets(self, presets: list[dict[str, Any]]) -> None:
+        self._index.clear()
+        rows = [self._cache_row(preset) for preset in presets]
+        self.beginResetModel()
+        self._presets = list(presets)
+        self._summaries = [row[0] for row in rows]
+        self._name_keys = [row[1] for row in rows]
+        self._seconds = [row[2] for row in rows]
+        self.endResetModel()
+
+    def presets(self) -> list[dict[str, Any]]:
+        return self._presets
+
+    def preset(self, row: int) -> dict[str, Any]:
+        return self._presets[row]
+
+    def preset_id(self, row: int) -> str | None:
+        return self._presets[row].get('id')
+
+    def search(self, query: str) -> dict[str, float]:
+        """预设 id -> 相关度得分，见 PresetSearchIndex.search()"""
+        return self._index.search(query)
+
+    def name_key(self, row: int) -> str:
+        return self._name_keys[row]
+
+    def total_seconds(self, row: int) -> int:
+        return self._seconds[row]
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._presets)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._summaries[row]
+        if role == self.IdRole:
+            return self._presets[row].get('id')
+        return None
+
+    def append_preset(self, preset: dict[str, Any]) -> int:
+        row = len(self._presets)
+        summary, name_key, seconds = self._cache_row(preset)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._presets.append(preset)
+        self._summaries.append(summary)
+        self._name_keys.append(name_key)
+        self._seconds.append(seconds)
+        self.endInsertRows()
+        return row
+
+    def update_preset(self, row: int, preset: dict[str, Any]) -> None:
+        """替换（或原地修改后刷新）一行"""
+        self._presets[row] = preset
+        self._summaries[row], self._name_keys[row], self._seconds[row] = self._cache_row(preset)
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def remove_rows(self, rows: list[int]) -> None:
+        for row in sorted(set(rows), reverse=True):
+            if not 0 <= row < len(self._presets):
+                continue
+            self._index.remove(self._presets[row].get('id'))
+            self.beginRemoveRows(QModelIndex(), row, row)
+            for column in (self._presets, self._summaries, self._name_keys, self._seconds):
+                del column[row]
+            self.endRemoveRows()
+
+    def swap_rows(self, first: int, second: int) -> None:
+        if first == second:
+            return
+        for column in (self._presets, self._summaries, self._name_keys, self._seconds):
+            column[first], column[second] = column[second], column[first]
+        low, high = sorted((first, second))
+        self.dataChanged.emit(self.index(low), self.index(high))
+
+
+class PresetFilterProxyModel(QSortFilterProxyModel):
+    """
+    预设列表的搜索 / 排序代理
+
+    搜索交给源模型的搜索索引，过滤只是查表；手动排序下有搜索词时按相关度排列，
+    按名称 / 时长排序时直接读取源模型缓存的小写名称与总秒数。
+    """
+
+    SORT_MODES = ("manual", "name", "duration")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._needle = ""
+        self._ranks: dict[str, float] = {}  # 预设 id -> 相关度，仅在有搜索词时使用
+        self._sort_mode = "manual"
+        self._bold_font = QFont()
+        self._bold_font.setBold(True)
+        self.setDynamicSortFilter(True)
+
+    @staticmethod
+    def _change_signals(model):
+        return (model.rowsInserted, model.rowsRemoved, model.modelReset, model.dataChanged)
+
+    def setSourceModel(self, model) -> None:
+        old = self.sourceModel()
+        if old is not None:
+            for signal in self._change_signals(old):
+                signal.disconnect(self._refresh_ranks)
+        if model is not None:
+            # 须先于代理自身的处理连接：代理重新过滤变化的行之前先按更新后的索引重新查询
+            for signal in self._change_signals(model):
+                signal.connect(self._refresh_ranks)
+        super().setSourceModel(model)
+        self._apply_sort()
+
+    def _refresh_ranks(self, *_args) -> None:
+        model = self.sourceModel()
+        if self._needle and model is not None:
+            self._ranks = model.search(self._needle)
+
+    def set_filter_text(self, text: str) -> None:
+        needle = (text or "").strip()
+        if needle == self._needle:
+            return
+        self._needle = needle
+        self._ranks = {}
+        self._refresh_ranks()
+        if self._sort_mode == "manual":
+            # 有无搜索词决定手动排序下是否按相关度排列
+            self._apply_sort()
+        else:
+            self.invalidateRowsFilter()
+
+    def filter_active(self) -> bool:
+        return bool(self._needle)
+
+    def set_sort_mode(self, mode: str) -> None:
+        if mode not in self.SORT_MODES:
+            mode = "manual"
+        if mode == self._sort_mode:
+            return
+        self._sort_mode = mode
+        self._apply_sort()
+
+    def _apply_sort(self) -> None:
+        if self._sort_mode == "manual" and not self._needle:
+            # 不排序即为源模型顺序，无需逐对比较
+            self.invalidateRowsFilter()
+            self.sort(-1)
+        else:
+            self.invalidate()
+            self.sort(0)
+
+    def filterAcceptsRow(self, source_row: int, source_parent) -> bool:
+        if not self._needle:
+            return True
+        return self.sourceModel().preset_id(source_row) in self._ranks
+
+    def lessThan(self, left, right) -> bool:
+        left_row = left.row()
+        right_row = right.row()
+        model = self.sourceModel()
+        if self._sort_mode == "name":
+            left_key, right_key = model.name_key(left_row), model.name_key(right_row)
+        elif self._sort_mode == "duration":
+            left_key, right_key = model.total_seconds(left_row), model.total_seconds(right_row)
+        elif self._needle:
+            # 相关度高的排在前面
+            left_key = -self._ranks.get(model.preset_id(left_row), 0.0)
+            right_key = -self._ranks.get(model.preset_id(right_row), 0.0)
+        else:
+            return left_row < right_row
+        if left_key == right_key:
+            # 键相同时保持手动顺序，排序结果稳定
+            return left_row < right_row
+        return left_key < right_key
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.FontRole and self._needle:
+            return self._bold_font
+        return super().data(index, role)
+
+    def source_rows(self, proxy_rows) -> list[int]:
+        return sorted({self.mapToSource(self.index(row, 0)).row() for row in proxy_rows})
+
+    def proxy_row(self, source_row: int) -> int:
+        model = self.sourceModel()
+        if model is None or not 0 <= source_row < model.rowCount():
+            return -1
+        return self.mapFromSource(model.index(source_row)).row()
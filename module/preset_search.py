@@ -0,0 +1,161 @@
+from collections import defaultdict
+from typing import Iterable
+
+# 匹配等级：整段相同 > 开头匹配 > 词首匹配 > 任意位置 > 模糊（三元组重合）
+_SCORE_EXACT = 400.0
+_SCORE_PREFIX = 300.0
+_SCORE_WORD = 200.0
+_SCORE_SUBSTRING = 100.0
+_SCORE_FUZZY = 50.0
+
+# 模糊匹配至少需要的三元组重合比例
+_FUZZY_MIN_OVERLAP = 0.5
+
+# 检索文本之间的分隔符：拼接成一个字符串后，整段 / 开头匹配都可以用一次 find 判断
+_SEP = "\x1f"
+
+
+def _normalize(text: str) -> str:
+    return " ".join(str(text).casefold().replace(_SEP, " ").split())
+
+
+def _grams(text: str, size: int) -> set[str]:
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+class PresetSearchIndex:
+    """
+    预设搜索索引（二元组 / 三元组倒排表）
+
+    每个预设对应若干检索文本（各语言标签、name_key 的各语言译名、格式化时长），
+    add() / remove() 按预设增量维护倒排表。查询时先用 n 元组求交得到候选，
+    再校验子串并评分；没有子串命中时按三元组重合比例做模糊匹配。
+    查询在上一次查询的基础上追加字符时，只在上一次的结果中继续查找。
+    """
+
+    def __init__(self):
+        self._docs: dict[str, str] = {}
+        self._doc_grams: dict[str, set[str]] = {}
+        self._postings: dict[str, set[str]] = defaultdict(set)
+        self._last_query = ""
+        self._last_results: dict[str, float] = {}
+        self._last_fuzzy = False
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._docs
+
+    def clear(self) -> None:
+        self._docs.clear()
+        self._doc_grams.clear()
+        self._postings.clear()
+        self._last_query = ""
+
+    def add(self, doc_id: str, texts: Iterable[str]) -> None:
+        """加入（或替换）一个预设的检索文本，texts 按重要程度排列"""
+        normalized = []
+        for text in texts:
+            text = _normalize(text)
+            if text and text not in normalized:
+                normalized.append(text)
+        joined = _SEP + _SEP.join(normalized) + _SEP
+        if self._docs.get(doc_id) == joined:
+            return
+        self.remove(doc_id)
+        # 跨越分隔符的 n 元组只会产生多余的候选，评分时会被排除
+        grams = _grams(joined, 2) | _grams(joined, 3)
+        postings = self._postings
+        for gram in grams:
+            postings[gram].add(doc_id)
+        self._docs[doc_id] = joined
+        self._doc_grams[doc_id] = grams
+        self._last_query = ""
+
+    def remove(self, doc_id: str) -> None:
+        if self._docs.pop(doc_id, None) is not None:
+            self._last_query = ""
+        for gram in self._doc_grams.pop(doc_id, ()):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(doc_id)
+                if not posting:
+                    del self._postings[gram]
+
+    def _candidates(self, query: str) -> Iterable[str]:
+        if self._last_query and query.startswith(self._last_query):
+            # 包含新查询的文本必然包含旧查询；模糊结果不能作为候选
+            if not self._last_fuzzy:
+                return self._last_results.keys()
+        if len(query) < 2:
+            return self._docs.keys()
+        if len(query) == 2:
+            return self._postings.get(query, ())
+        # 从最短的倒排表开始求交
+        postings = sorted((self._postings.get(gram, set()) for gram in _grams(query, 3)), key=len)
+        if not postings[0]:
+            return ()
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result &= posting
+            if not result:
+                break
+        return result
+
+    @staticmethod
+    def _score(joined: str, query: str) -> float:
+        position = joined.find(_SEP + query + _SEP)
+        if position >= 0:
+            score = _SCORE_EXACT
+        else:
+            position = joined.find(_SEP + query)
+            if position >= 0:
+                score = _SCORE_PREFIX
+            else:
+                position = joined.find(query)
+                if position < 0:
+                    return 0.0
+                score = _SCORE_SUBSTRING if joined[position - 1].isalnum() else _SCORE_WORD
+        # 同等级时命中排在前面的文本（标签优先于时长）与更短的预设优先
+        return score - joined.count(_SEP, 0, position + 1) - len(joined) / 1000
+
+    def _fuzzy(self, query: str) -> dict[str, float]:
+        query_grams = _grams(query, 3)
+        counts: dict[str, int] = defaultdict(int)
+        for gram in query_grams:
+            for doc_id in self._postings.get(gram, ()):
+                counts[doc_id] += 1
+        needed = max(1, int(len(query_grams) * _FUZZY_MIN_OVERLAP + 0.5))
+        return {
+            doc_id: _SCORE_FUZZY * count / len(query_grams)
+            for doc_id, count in counts.items()
+            if count >= needed
+        }
+
+    def search(self, query: str) -> dict[str, float]:
+        """
+        返回 预设 id -> 得分（越高越相关）
+
+        查询为空时返回空字典，由调用方视为不过滤。
+        """
+        query = _normalize(query)
+        if not query:
+            self._last_query = ""
+            return {}
+        if query == self._last_query:
+            return self._last_results
+        docs = self._docs
+        score = self._score
+        results = {}
+        for doc_id in self._candidates(query):
+            value = score(docs[doc_id], query)
+            if value > 0:
+                results[doc_id] = value
+        fuzzy = not results and len(query) >= 4
+        if fuzzy:
+            results = self._fuzzy(query)
+        self._last_query = query
+        self._last_results = results
+        self._last_fuzzy = fuzzy
+        return results
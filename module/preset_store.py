@@ -0,0 +1,275 @@
+import bisect
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Iterable, Mapping
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS presets (
+    id TEXT PRIMARY KEY,
+    position REAL NOT NULL,
+    name TEXT NOT NULL DEFAULT '',
+    total_seconds INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_presets_position ON presets(position);
+CREATE INDEX IF NOT EXISTS idx_presets_name ON presets(name);
+CREATE INDEX IF NOT EXISTS idx_presets_duration ON presets(total_seconds);
+"""
+
+
+def _preset_name(preset: dict[str, Any]) -> str:
+    """用于名称索引的小写名称：当前语言标签，其次任一语言标签，最后为 name_key"""
+    label = preset.get('label')
+    if not label:
+        labels = preset.get('labels') or {}
+        label = next(iter(labels.values()), '') if isinstance(labels, dict) else ''
+    return str(label or preset.get('name_key') or '').lower()
+
+
+def _preset_total_seconds(preset: dict[str, Any]) -> int:
+    try:
+        return int(preset.get('hours', 0)) * 3600 + int(preset.get('minutes', 0)) * 60 + int(preset.get('seconds', 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def increasing_subset(values: list[float | None]) -> set[int]:
+    """最长严格递增子序列的下标（跳过 None），这些元素可以保持原位置不动"""
+    tails: list[float] = []
+    tail_indices: list[int] = []
+    previous: list[int] = [-1] * len(values)
+    for index, value in enumerate(values):
+        if value is None:
+            continue
+        slot = bisect.bisect_left(tails, value)
+        if slot == len(tails):
+            tails.append(value)
+            tail_indices.append(index)
+        else:
+            tails[slot] = value
+            tail_indices[slot] = index
+        previous[index] = tail_indices[slot - 1] if slot > 0 else -1
+    keep = set()
+    index = tail_indices[-1] if tail_indices else -1
+    while index >= 0:
+        keep.add(index)
+        index = previous[index]
+    return keep
+
+
+def _assign_positions(old_positions: list[float | None]) -> list[float]:
+    """
+    为新顺序分配位置：尽量保留原位置，只给新增或移动过的预设在相邻位置之间插值
+
+    删除、追加、移动单个预设时只有少数行的位置发生变化。
+    """
+    count = len(old_positions)
+    keep = increasing_subset(old_positions)
+    positions: list[float | None] = [old_positions[i] if i in keep else None for i in range(count)]
+    start = 0
+    while start < count:
+        if positions[start] is not None:
+            start += 1
+            continue
+        end = start
+        while end < count and positions[end] is None:
+            end += 1
+        gap = end - start
+        low = positions[start - 1] if start > 0 else None
+        high = positions[end] if end < count else None
+        for offset in range(gap):
+            if low is None and high is None:
+                value = float(offset)
+            elif low is None:
+                value = high - (gap - offset)
+            elif high is None:
+                value = low + offset + 1
+            else:
+                value = low + (high - low) * (offset + 1) / (gap + 1)
+            positions[start + offset] = value
+        start = end
+    result = [float(position) for position in positions]
+    if any(a >= b for a, b in zip(result, result[1:])):
+        # 多次插值后精度耗尽，整体重新编号
+        return [float(i) for i in range(count)]
+    return result
+
+
+_UPSERT = (
+    "INSERT INTO presets (id, position, name, total_seconds, data) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT(id) DO UPDATE SET position = excluded.position, name = excluded.name, "
+    "total_seconds = excluded.total_seconds, data = excluded.data"
+)
+
+
+class _PresetWriter:
+    """
+    预设库的后台写入线程
+
+    与设置文件的后台写入相同，按提交顺序在单独的线程中执行，每次提交一个事务；
+    线程在首次提交时启动。
+    """
+
+    def __init__(self, conn: sqlite3.Connection, on_failure):
+        self._conn = conn
+        self._on_failure = on_failure
+        self._cond = threading.Condition()
+        self._ops: list[tuple[bool, list, list]] = []  # (先清空整张表, 删除, 插入或更新)
+        self._busy = False
+        self._thread: threading.Thread | None = None
+
+    def submit(self, replace: bool, deletes: list, upserts: list) -> None:
+        with self._cond:
+            self._ops.append((replace, deletes, upserts))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="preset-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """等待已提交的事务全部写出；超时返回 False"""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._ops and not self._busy, timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: bool(self._ops))
+                replace, deletes, upserts = self._ops.pop(0)
+                self._busy = True
+            try:
+                with self._conn:
+                    if replace:
+                        self._conn.execute("DELETE FROM presets")
+                    if deletes:
+                        self._conn.executemany("DELETE FROM presets WHERE id = ?", deletes)
+                    if upserts:
+                        self._conn.executemany(_UPSERT, upserts)
+            except sqlite3.Error as e:
+                logger.error("Failed to save presets: %s", e)
+                self._on_failure()
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+
+class PresetStore:
+    """
+    倒计时预设存储（标准库 SQLite，settings/presets.sqlite3）
+
+    以 id 为主键，并按位置、名称、总时长建立索引。预设不再写入 timer_settings.json，
+    sync() 与内存中的上次状态比较，只对新增、修改、删除或移动过的行执行 SQL，
+    普通设置保存与单个预设编辑的磁盘开销不随预设数量增长。
+    增量在调用线程中算出，SQL 事务交给后台线程执行，不阻塞事件循环；退出前 flush() 等待写完。
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._conn: sqlite3.Connection | None = None
+        # id -> (位置, 序列化后的预设, 修订号)，用于计算增量
+        self._rows: dict[str, tuple[float, str, int | None]] = {}
+        # 后台写入失败后内存状态与数据库不再一致，下一次同步整表重写
+        self._stale = False
+        self._writer: _PresetWriter | None = None
+        try:
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            # 连接在后台写入线程中使用；读取只在启动时、首次写入之前进行
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            self._writer = _PresetWriter(conn, self._on_write_failed)
+        except sqlite3.Error as e:
+            logger.error("Failed to open preset store %s: %s", db_path, e)
+
+    @property
+    def available(self) -> bool:
+        return self._conn is not None
+
+    def load_all(self) -> list[dict[str, Any]]:
+        """按位置顺序读取全部预设"""
+        if self._conn is None:
+            return []
+        presets = []
+        self._rows = {}
+        try:
+            for preset_id, position, data in self._conn.execute(
+                "SELECT id, position, data FROM presets ORDER BY position"
+            ):
+                try:
+                    preset = json.loads(data)
+                except ValueError:
+                    logger.warning("Skipping unreadable preset %s", preset_id)
+                    continue
+                presets.append(preset)
+                self._rows[preset_id] = (float(position), data, None)
+        except sqlite3.Error as e:
+            logger.error("Failed to read presets: %s", e)
+        return presets
+
+    def sync(self, presets: Iterable[dict[str, Any]], revisions: Mapping[str, int] | None = None) -> int:
+        """
+        将存储同步为给定的预设列表（顺序即位置）
+
+        只写入变化的行，全部改动在后台线程的一个事务中提交；返回提交的改动行数。
+        提供 revisions（id -> 修订号）时，修订号与上次同步相同的预设不再序列化比较。
+        """
+        if self._conn is None:
+            return 0
+        entries = []
+        seen = set()
+        for preset in presets:
+            preset_id = preset.get('id')
+            if not isinstance(preset_id, str) or preset_id in seen:
+                continue
+            seen.add(preset_id)
+            entries.append((preset_id, preset))
+        positions = _assign_positions([
+            self._rows[preset_id][0] if preset_id in self._rows else None for preset_id, _preset in entries
+        ])
+
+        replace = self._stale
+        if replace:
+            self._stale = False
+            self._rows = {}
+        rows: dict[str, tuple[float, str, int | None]] = {}
+        upserts = []
+        for (preset_id, preset), position in zip(entries, positions):
+            old = self._rows.get(preset_id)
+            revision = revisions.get(preset_id) if revisions is not None else None
+            if old is not None and revision is not None and old[2] == revision:
+                data = old[1]
+            else:
+                data = json.dumps(preset, ensure_ascii=False, sort_keys=True)
+            rows[preset_id] = (position, data, revision)
+            if old is None or old[:2] != (position, data):
+                upserts.append((preset_id, position, _preset_name(preset), _preset_total_seconds(preset), data))
+        deletes = [(preset_id,) for preset_id in self._rows.keys() - rows.keys()]
+        if not upserts and not deletes and not replace:
+            return 0
+        self._rows = rows
+        self._writer.submit(replace, deletes, upserts)
+        return len(upserts) + len(deletes)
+
+    def _on_write_failed(self) -> None:
+        # 在写入线程中调用
+        self._stale = True
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """等待后台写入完成（退出前调用）"""
+        return self._writer.flush(timeout) if self._writer is not None else True
+
+    def close(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+            self._conn = None
@@ -1,11 +1,11 @@
+import copy
 import logging
 import os
 import sys
-import random
 import uuid
 from typing import TYPE_CHECKING, cast
 
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QColor, QFontDatabase, QIcon, QKeySequence
 from PyQt6.QtWidgets import (
     QApplication,
@@ -18,7 +18,6 @@ from PyQt6.QtWidgets import (
     QVBoxLayout,
     QWidget,
     QKeySequenceEdit,
-    QListWidgetItem,
 )
 from qfluentwidgets import (
     BodyLabel as QLabel,
@@ -31,7 +30,7 @@ from qfluentwidgets import (
     FluentIcon,
     IconWidget,
     LineEdit as QLineEdit,
-    ListWidget as QListWidget,
+    ListView,
     MessageBox,
     Pivot,
     PushSettingCard,
@@ -51,11 +50,13 @@ from qfluentwidgets.common.config import isDarkTheme
 from .constants import (
     APP_VERSION,
     DEFAULT_COUNTDOWN_PRESETS,
+    DEFAULT_COUNTDOWN_TIME,
     DEFAULT_SHORTCUTS,
     PROJECT_URL,
 )
 from .localization import LANGUAGES
 from .paths import get_base_path
+from .preset_list_model import PresetFilterProxyModel, PresetListModel
 
 logger = logging.getLogger(__name__)
 
@@ -72,9 +73,20 @@ class SettingsDialog(QDialog):
         self._initial_lang_code = self._current_lang_code
         self._initial_theme_mode = self.parent_window.settings.get("theme_mode", "auto")
         self._other_lang_code = self._find_other_language(self._current_lang_code)
-        self._preset_data = self._load_preset_snapshot()
-        self._preset_filter_text = ""
+        self._preset_model = PresetListModel(
+            self._load_preset_snapshot(), self._preset_row_text, self._preset_search_terms, self
+        )
+        # 本次编辑中新增或修改过的预设 id，应用时主窗口只重新校验这些条目
+        self._touched_preset_ids: set[str] = set()
         self._preset_sort_mode = self.parent_window.settings.get("preset_sort_mode", "manual")
+        self._preset_proxy = PresetFilterProxyModel(self)
+        self._preset_proxy.setSourceModel(self._preset_model)
+        self._preset_proxy.set_sort_mode(self._preset_sort_mode)
+        # 搜索防抖：停止输入一小段时间后才查询
+        self._preset_search_timer = QTimer(self)
+        self._preset_search_timer.setSingleShot(True)
+        self._preset_search_timer.setInterval(150)
+        self._preset_search_timer.timeout.connect(self._apply_preset_search)
         self._applied_once = False
         self._last_fluent_theme_state: str | None = None
         self.setWindowTitle(self.tr('settings_title'))
@@ -92,6 +104,8 @@ class SettingsDialog(QDialog):
         self.setMinimumSize(800, 600)  # 允许用户缩小窗口
         self.resize(850, 800)  # 设置默认大小
         self.init_ui()
+        # 字体、颜色、铃声选择器直接写入主窗口设置；应用时与此快照比较得出需要重新应用的键
+        self._settings_snapshot = self._snapshot_settings()
         self._sync_fluent_theme(self.parent_window.settings.get("theme_mode", "auto"))
         
     def tr(self, sourceText: str, disambiguation: str | None = None, n: int = -1) -> str:  # type: ignore[override]
@@ -111,12 +125,34 @@ class SettingsDialog(QDialog):
             return os.path.join(self._base_path(), sound_path)
         return sound_path
 
+    def _sound_exists(self, sound_path: str) -> bool:
+        library = getattr(self.parent_window, 'sound_library', None)
+        if library is not None:
+            return library.exists(sound_path)
+        return bool(sound_path) and os.path.exists(sound_path)
+
     def _find_other_language(self, current_code: str) -> str:
         for code in LANGUAGES.keys():
             if code != current_code:
                 return code
         return current_code
 
+    def _snapshot_settings(self) -> dict:
+        # 预设由 update_presets() 单独记录改动，不参与比较
+        return copy.deepcopy({
+            key: value for key, value in self.parent_window.settings.items() if key != 'countdown_presets'
+        })
+
+    def _changed_since_snapshot(self) -> set[str]:
+        settings = self.parent_window.settings
+        snapshot = self._settings_snapshot
+        changed = {
+            key for key, value in settings.items()
+            if key != 'countdown_presets' and (key not in snapshot or snapshot[key] != value)
+        }
+        changed.update(key for key in snapshot if key not in settings)
+        return changed
+
     def _load_preset_snapshot(self):
         presets = self.parent_window.settings.get('countdown_presets')
         snapshot = []
@@ -547,6 +583,16 @@ class SettingsDialog(QDialog):
             self.size_card.setContent(f"{v}px")
         self.size_slider.valueChanged.connect(_update_size)
         style_group.addSettingCard(self.size_card)
+
+        self.painted_face_card = SwitchSettingCard(
+            FluentIcon.SPEED_HIGH,
+            self.tr('painted_face'),
+            None,
+            parent=self,
+        )
+        self.painted_face_card.setChecked(self.parent_window.settings.get("painted_face", False))
+        self._apply_switch_status(self.painted_face_card, self.tr('painted_face_desc'))
+        style_group.addSettingCard(self.painted_face_card)
         layout.addWidget(style_group)
 
         theme_group = SettingCardGroup(self.tr('theme_settings'), widget)
@@ -651,15 +697,15 @@ class SettingsDialog(QDialog):
         self.hours_spin = QSpinBox()
         self.hours_spin.setRange(0, 99)
         self.hours_spin.setSuffix(' ' + self.tr('hours'))
-        self.hours_spin.setValue(self.parent_window.settings.get("countdown_hours", 0))
+        self.hours_spin.setValue(self.parent_window.settings.get("countdown_hours", DEFAULT_COUNTDOWN_TIME["countdown_hours"]))
         self.minutes_spin = QSpinBox()
         self.minutes_spin.setRange(0, 59)
         self.minutes_spin.setSuffix(' ' + self.tr('minutes'))
-        self.minutes_spin.setValue(self.parent_window.settings.get("countdown_minutes", 25))
+        self.minutes_spin.setValue(self.parent_window.settings.get("countdown_minutes", DEFAULT_COUNTDOWN_TIME["countdown_minutes"]))
         self.seconds_spin = QSpinBox()
         self.seconds_spin.setRange(0, 59)
         self.seconds_spin.setSuffix(' ' + self.tr('seconds'))
-        self.seconds_spin.setValue(self.parent_window.settings.get("countdown_seconds", 0))
+        self.seconds_spin.setValue(self.parent_window.settings.get("countdown_seconds", DEFAULT_COUNTDOWN_TIME["countdown_seconds"]))
         time_layout.addWidget(self.hours_spin)
         time_layout.addWidget(self.minutes_spin)
         time_layout.addWidget(self.seconds_spin)
@@ -849,11 +895,13 @@ class SettingsDialog(QDialog):
         self.preset_search_edit.textChanged.connect(self._on_preset_search_changed)
         preset_layout.addWidget(self.preset_search_edit)
 
-        self.preset_list = QListWidget()
+        self.preset_list = ListView()
+        self.preset_list.setModel(self._preset_proxy)
+        self.preset_list.setUniformItemSizes(True)
         self.preset_list.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         self.preset_list.setMinimumHeight(260)
-        self.preset_list.itemSelectionChanged.connect(self._update_preset_button_states)
-        self.preset_list.itemDoubleClicked.connect(lambda _: self.edit_selected_preset())
+        self.preset_list.selectionModel().selectionChanged.connect(lambda *_: self._update_preset_button_states())
+        self.preset_list.doubleClicked.connect(lambda _: self.edit_selected_preset())
         preset_layout.addWidget(self.preset_list)
 
         layout.addWidget(preset_group)
@@ -1008,7 +1056,6 @@ class SettingsDialog(QDialog):
         layout.addStretch()
         widget.setLayout(layout)
 
-        self._refresh_preset_list()
         self._update_preset_button_states()
         scroll.setWidget(widget)
         scroll.enableTransparentBackground()
@@ -1024,15 +1071,15 @@ class SettingsDialog(QDialog):
         current = self.parent_window.settings.get("language", "zh_CN")
         if new_lang == current:
             return
-        self.parent_window.settings["language"] = new_lang
-        self.parent_window.apply_settings(preserve_elapsed=True, preserve_position=True)
-        self.parent_window.create_tray_menu()
-        try:
-            self.parent_window.reload_shortcuts()
-        except Exception:
-            pass
+        # 只预览语言分组，不影响计时；尚未应用的改动（如选择器写入的颜色）先取出，预览后放回
+        settings = self.parent_window.settings
+        pending = settings.take_changes()
+        settings["language"] = new_lang
+        self.parent_window.apply_settings_changes()
         # 仅预览，不保存
-        self.parent_window.settings["language"] = current
+        settings["language"] = current
+        settings.take_changes()
+        settings.mark_changed(pending - {"language"})
 
     def _format_preset_duration(self, preset):
         hours = max(0, min(99, int(preset.get('hours', 0))))
@@ -1075,44 +1122,40 @@ class SettingsDialog(QDialog):
                 return translated
         return self._format_duration_text(preset)
 
-    def _preset_summary(self, preset):
-        return f"{self._resolve_preset_label(preset)} · {self._format_preset_duration(preset)}"
+    @property
+    def _preset_data(self):
+        """对话框中正在编辑的预设列表（由列表模型持有，修改须经由模型）"""
+        return self._preset_model.presets()
 
-    def _refresh_preset_list(self):
-        if not hasattr(self, 'preset_list'):
-            return
-        self.preset_list.clear()
-        self._preset_list_indices = []
-        filter_text = (getattr(self, "_preset_filter_text", "") or "").strip().lower()
-        indices = list(range(len(self._preset_data)))
-        sort_mode = getattr(self, "_preset_sort_mode", "manual")
-        if sort_mode == "name":
-            indices.sort(
-                key=lambda i: self._resolve_preset_label(self._preset_data[i]).lower()
-            )
-        elif sort_mode == "duration":
-            indices.sort(key=lambda i: self._preset_total_seconds(self._preset_data[i]))
-        for idx in indices:
-            preset = self._preset_data[idx]
-            summary = self._preset_summary(preset)
-            if filter_text and filter_text not in summary.lower():
-                continue
-            item = QListWidgetItem(summary)
-            if filter_text:
-                font = item.font()
-                font.setBold(True)
-                item.setFont(font)
-            item.setData(Qt.ItemDataRole.UserRole, preset.get('id'))
-            self.preset_list.addItem(item)
-            self._preset_list_indices.append(idx)
+    def _preset_row_text(self, preset):
+        label = self._resolve_preset_label(preset)
+        return label, f"{label} · {self._format_preset_duration(preset)}"
+
+    def _preset_search_terms(self, preset):
+        """搜索索引的检索文本：显示名称、各语言标签、name_key 的各语言译名与时长"""
+        terms = [self._resolve_preset_label(preset)]
+        labels = preset.get('labels')
+        if isinstance(labels, dict):
+            terms.extend(text for text in labels.values() if isinstance(text, str))
+        name_key = preset.get('name_key')
+        if isinstance(name_key, str) and name_key:
+            terms.extend(texts.get(name_key, '') for texts in LANGUAGES.values())
+        terms.append(self._format_duration_text(preset))
+        terms.append(self._format_preset_duration(preset))
+        return terms
+
+    def _select_preset_row(self, source_row):
+        proxy_row = self._preset_proxy.proxy_row(source_row)
+        if proxy_row >= 0:
+            self.preset_list.setCurrentIndex(self._preset_proxy.index(proxy_row, 0))
 
     def _get_selected_preset_index(self):
         if not hasattr(self, 'preset_list'):
             return -1
-        row = self.preset_list.currentRow()
-        if 0 <= row < len(getattr(self, "_preset_list_indices", [])):
-            return self._preset_list_indices[row]
-        return -1
+        index = self.preset_list.currentIndex()
+        if not index.isValid():
+            return -1
+        return self._preset_proxy.mapToSource(index).row()
 
     def _update_preset_button_states(self):
         selected = self._get_selected_preset_indices()
@@ -1138,27 +1181,22 @@ class SettingsDialog(QDialog):
         if clear_btn is not None:
             clear_btn.setEnabled(has_selection)
 
-    @staticmethod
-    def _preset_total_seconds(preset) -> int:
-        return (
-            max(0, int(preset.get("hours", 0))) * 3600
-            + max(0, int(preset.get("minutes", 0))) * 60
-            + max(0, int(preset.get("seconds", 0)))
-        )
-
     def _get_selected_preset_indices(self):
         if not hasattr(self, 'preset_list'):
             return []
-        indices = []
-        for item in self.preset_list.selectedItems():
-            row = self.preset_list.row(item)
-            if 0 <= row < len(getattr(self, "_preset_list_indices", [])):
-                indices.append(self._preset_list_indices[row])
-        return sorted(set(indices))
+        rows = [index.row() for index in self.preset_list.selectionModel().selectedRows()]
+        return self._preset_proxy.source_rows(rows)
 
     def _on_preset_search_changed(self, text: str) -> None:
-        self._preset_filter_text = text or ""
-        self._refresh_preset_list()
+        if text and text.strip():
+            self._preset_search_timer.start()
+        else:
+            # 清空搜索立即生效
+            self._preset_search_timer.stop()
+            self._apply_preset_search()
+
+    def _apply_preset_search(self) -> None:
+        self._preset_proxy.set_filter_text(self.preset_search_edit.text())
         self._update_preset_button_states()
 
     def _on_preset_sort_changed(self, _index: int) -> None:
@@ -1166,7 +1204,7 @@ class SettingsDialog(QDialog):
         if sort_mode not in ("manual", "name", "duration"):
             sort_mode = "manual"
         self._preset_sort_mode = sort_mode
-        self._refresh_preset_list()
+        self._preset_proxy.set_sort_mode(sort_mode)
         self._update_preset_button_states()
 
     def select_all_presets(self):
@@ -1197,9 +1235,9 @@ class SettingsDialog(QDialog):
                 'seconds': data['seconds'],
             }
             self._apply_label_result(new_entry, data)
-            self._preset_data.append(new_entry)
-            self._refresh_preset_list()
-            self.preset_list.setCurrentRow(len(self._preset_data) - 1)
+            row = self._preset_model.append_preset(new_entry)
+            self._touched_preset_ids.add(new_entry['id'])
+            self._select_preset_row(row)
             self._update_preset_button_states()
 
     def edit_selected_preset(self):
@@ -1231,9 +1269,9 @@ class SettingsDialog(QDialog):
             self._apply_label_result(preset, data)
             if not allow_auto:
                 preset.pop('name_key', None)
-            self._preset_data[index] = preset
-            self._refresh_preset_list()
-            self.preset_list.setCurrentRow(index)
+            self._preset_model.update_preset(index, preset)
+            self._touched_preset_ids.add(preset['id'])
+            self._select_preset_row(index)
 
     def remove_selected_preset(self):
         indices = self._get_selected_preset_indices()
@@ -1248,9 +1286,7 @@ class SettingsDialog(QDialog):
             message,
         ):
             return
-        for index in sorted(indices, reverse=True):
-            self._preset_data.pop(index)
-        self._refresh_preset_list()
+        self._preset_model.remove_rows(indices)
         self._update_preset_button_states()
 
     def move_selected_preset(self, offset):
@@ -1261,12 +1297,9 @@ class SettingsDialog(QDialog):
         new_index = index + offset
         if not 0 <= new_index < len(self._preset_data):
             return
-        self._preset_data[index], self._preset_data[new_index] = (
-            self._preset_data[new_index],
-            self._preset_data[index],
-        )
-        self._refresh_preset_list()
-        self.preset_list.setCurrentRow(new_index)
+        self._preset_model.swap_rows(index, new_index)
+        self.preset_list.clearSelection()
+        self._select_preset_row(new_index)
 
     def reset_presets(self):
         if not self._confirm(
@@ -1274,8 +1307,8 @@ class SettingsDialog(QDialog):
             self.tr('preset_reset_confirm_msg'),
         ):
             return
-        self._preset_data = [dict(preset) for preset in DEFAULT_COUNTDOWN_PRESETS]
-        self._refresh_preset_list()
+        self._preset_model.reset_presets([dict(preset) for preset in DEFAULT_COUNTDOWN_PRESETS])
+        self._touched_preset_ids.update(preset['id'] for preset in self._preset_data)
         self._update_preset_button_states()
 
     def apply_selected_preset_to_timer(self):
@@ -1463,7 +1496,7 @@ class SettingsDialog(QDialog):
         
         current_sound = self.parent_window.settings.get("sound_file", "")
         resolved_sound = self._resolve_sound_path(current_sound)
-        display_name = os.path.basename(current_sound) if current_sound and os.path.exists(resolved_sound) else self.tr('no_sound_file')
+        display_name = os.path.basename(current_sound) if current_sound and self._sound_exists(resolved_sound) else self.tr('no_sound_file')
         self.sound_file_card = PushSettingCard(
             self.tr('choose_sound'),
             FluentIcon.MUSIC_FOLDER,
@@ -1767,7 +1800,7 @@ class SettingsDialog(QDialog):
         if sound_file:
             sound_file = self._resolve_sound_path(sound_file)
             
-            if os.path.exists(sound_file):
+            if self._sound_exists(sound_file):
                 self.parent_window.play_sound(sound_file)
             else:
                 QApplication.beep()
@@ -1776,9 +1809,8 @@ class SettingsDialog(QDialog):
     
     def random_sound(self):
         """随机选择铃声"""
-        sound_files = self.parent_window.get_sound_files()
-        if sound_files:
-            selected_sound = random.choice(sound_files)
+        selected_sound = self.parent_window.sound_library.random_choice()
+        if selected_sound:
             # 保存相对路径
             base_path = self._base_path()
             try:
@@ -1836,6 +1868,10 @@ class SettingsDialog(QDialog):
     def _serialize_presets(self):
         serialized = []
         for preset in self._preset_data:
+            if preset.get('id') not in self._touched_preset_ids:
+                # 未改动的条目原样交给主窗口，由其复用已校验的版本
+                serialized.append(preset)
+                continue
             entry = {
                 'id': preset.get('id') or f"preset_{uuid.uuid4().hex[:8]}",
                 'mode': 'countdown',
@@ -1861,10 +1897,12 @@ class SettingsDialog(QDialog):
         return serialized
 
     def apply_settings(self):
-        """应用设置"""
-        self.parent_window.settings["countdown_presets"] = self._serialize_presets()
+        """应用设置（只有值发生变化的设置分组会被重新应用）"""
+        self.parent_window.update_presets(self._serialize_presets(), self._touched_preset_ids)
+        self._touched_preset_ids = set()
         self.parent_window.settings["bg_opacity"] = self.opacity_slider.value()
         self.parent_window.settings["night_mode"] = self.night_mode_card.isChecked()
+        self.parent_window.settings["painted_face"] = self.painted_face_card.isChecked()
         self.parent_window.settings["timer_mode"] = self.mode_combo.currentText()
         # 保存语言无关的键
         self.parent_window.settings["timer_mode_key"] = {0: 'countup', 1: 'countdown', 2: 'clock'}.get(self.mode_combo.currentIndex(), 'countdown')
@@ -1917,13 +1955,11 @@ class SettingsDialog(QDialog):
         # 应用窗口大小设置（滑块控制字体大小）
         self.parent_window.settings["font_size"] = self.size_slider.value()
 
-        self.parent_window.apply_settings(preserve_position=True)
+        # 选择器在应用之前写入的键同样需要应用（其间的语言预览可能已取走它们的改动记录）
+        self.parent_window.settings.mark_changed(self._changed_since_snapshot())
+        self.parent_window.apply_settings_changes()
+        self._settings_snapshot = self._snapshot_settings()
         self._sync_fluent_theme(theme_mode)
-        # 让主窗口根据新快捷键重载绑定
-        try:
-            self.parent_window.reload_shortcuts()
-        except Exception:
-            pass
         self.parent_window.save_settings(immediate=True)  # 用户主动保存，立即执行
         self._applied_once = True
         
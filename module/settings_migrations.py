@@ -0,0 +1,78 @@
+import logging
+import os
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from .timer_window import TimerWindow
+
+logger = logging.getLogger(__name__)
+
+Migration = Callable[[dict[str, Any], "TimerWindow"], None]
+
+
+def _infer_timer_mode_key(settings: dict[str, Any], window: "TimerWindow") -> None:
+    """旧版本只有文本模式 timer_mode，推断语言无关的 timer_mode_key"""
+    if settings.get('timer_mode_key') not in ('countup', 'countdown', 'clock'):
+        settings['timer_mode_key'] = window.derive_mode_key(settings.get('timer_mode', ''))
+
+
+def _derive_countdown_action_key(settings: dict[str, Any], window: "TimerWindow") -> None:
+    """旧版本只有文本动作 countdown_action，推断 countdown_action_key"""
+    if settings.get('countdown_action_key') not in ('beep', 'flash', 'beep_flash'):
+        settings['countdown_action_key'] = window.derive_action_key(settings.get('countdown_action', ''))
+
+
+def _relativize_sound_file(settings: dict[str, Any], window: "TimerWindow") -> None:
+    """旧版本保存的是铃声绝对路径，位于 sounds 文件夹内的转换为相对路径"""
+    sound_file = settings.get('sound_file')
+    if not sound_file or not isinstance(sound_file, str) or not os.path.isabs(sound_file):
+        return
+    try:
+        rel_path = os.path.relpath(sound_file, window.base_path)
+        if rel_path.startswith('sounds') and os.path.exists(sound_file):
+            settings['sound_file'] = rel_path
+            logger.info("Converted absolute sound path to relative: %s", rel_path)
+    except (ValueError, OSError):
+        # 转换失败，保持原样
+        pass
+
+
+def _normalize_presets(settings: dict[str, Any], window: "TimerWindow") -> None:
+    """补全倒计时预设的 id / 标签结构"""
+    settings['countdown_presets'], _changed = window._normalize_countdown_presets(settings.get('countdown_presets'))
+
+
+# 按顺序执行的迁移步骤：(执行后的版本号, 迁移函数)；新增步骤只能追加在末尾
+MIGRATIONS: tuple[tuple[int, Migration], ...] = (
+    (1, _infer_timer_mode_key),
+    (2, _derive_countdown_action_key),
+    (3, _relativize_sound_file),
+    (4, _normalize_presets),
+)
+
+CURRENT_SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(settings: dict[str, Any]) -> int:
+    version = settings.get('schema_version', 0)
+    if not isinstance(version, int) or isinstance(version, bool) or version < 0:
+        return 0
+    return version
+
+
+def migrate_settings(settings: dict[str, Any], window: "TimerWindow") -> bool:
+    """
+    将设置迁移到当前 schema_version
+
+    只执行版本号高于当前设置的步骤；已是最新版本时不做任何工作。返回是否执行了迁移。
+    """
+    version = schema_version(settings)
+    if version >= CURRENT_SCHEMA_VERSION:
+        return False
+    for target_version, migration in MIGRATIONS:
+        if version < target_version:
+            migration(settings, window)
+            version = target_version
+    settings['schema_version'] = version
+    logger.info("Settings migrated to schema version %d", version)
+    return True
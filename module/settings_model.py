@@ -0,0 +1,105 @@
+from typing import Iterable
+
+# 设置分组：每组对应 TimerWindow 中的一个定向应用函数；未列出的键在使用时按需读取，无需重新应用
+SETTING_GROUPS: dict[str, frozenset[str]] = {
+    "appearance": frozenset({
+        "font_family",
+        "font_size",
+        "text_color",
+        "bg_color",
+        "bg_opacity",
+        "night_mode",
+        "rounded_corners",
+        "corner_radius",
+        "painted_face",
+        "theme_mode",
+        # 时钟格式决定显示文本与窗口尺寸，但不影响计时值
+        "clock_format_24h",
+        "clock_show_seconds",
+        "clock_show_date",
+        "clock_show_am_pm",
+        "clock_am_pm_style",
+        "clock_am_pm_position",
+    }),
+    "audio": frozenset({"sound_volume", "sound_file"}),
+    "shortcuts": frozenset({"shortcuts"}),
+    "mode": frozenset({
+        "timer_mode",
+        "timer_mode_key",
+        "countdown_hours",
+        "countdown_minutes",
+        "countdown_seconds",
+    }),
+    "language": frozenset({"language"}),
+    "presets": frozenset({"countdown_presets", "preset_sort_mode"}),
+}
+
+
+def setting_groups(keys: Iterable[str]) -> set[str]:
+    """返回受这些键影响的设置分组"""
+    keys = set(keys)
+    return {group for group, members in SETTING_GROUPS.items() if keys & members}
+
+
+class SettingsModel(dict):
+    """
+    记录改动键的设置字典
+
+    赋值时与旧值比较，值变化（或重新赋值同一个列表/字典对象，视为原地修改过）才记为改动；
+    take_changes() 取出并清空改动集合，供 TimerWindow.apply_settings_changes() 定向应用。
+    未保存的键另行记录，take_unsaved() 供保存时只写出改动的部分。
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._changed: set[str] = set()
+        self._unsaved: set[str] = set()
+
+    def _touch(self, key) -> None:
+        self._changed.add(key)
+        self._unsaved.add(key)
+
+    def __setitem__(self, key, value):
+        if key not in self:
+            self._touch(key)
+        else:
+            old = super().__getitem__(key)
+            if old != value or (old is value and isinstance(value, (list, dict))):
+                self._touch(key)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._touch(key)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return super().__getitem__(key)
+
+    def pop(self, key, *default):
+        if key in self:
+            self._touch(key)
+        return super().pop(key, *default)
+
+    def take_changes(self) -> set[str]:
+        """取出自上次调用以来改动过的键"""
+        changed, self._changed = self._changed, set()
+        return changed
+
+    def take_unsaved(self) -> set[str]:
+        """取出自上次保存以来改动过的键"""
+        unsaved, self._unsaved = self._unsaved, set()
+        return unsaved
+
+    def mark_changed(self, keys: Iterable[str]) -> None:
+        """把 keys 记为改动（只影响下一次应用，不影响保存记录）"""
+        self._changed.update(keys)
+
+    def mark_clean(self) -> None:
+        """丢弃改动记录（调用方已自行应用了这些改动）"""
+        self._changed.clear()
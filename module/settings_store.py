@@ -0,0 +1,295 @@
+import copy
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Iterable
+
+from .paths import get_base_path
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_LANGUAGES = ('zh_CN', 'en_US')
+
+# 改动日志超过任一阈值时，下一次保存改为写完整快照（压缩）
+JOURNAL_MAX_ENTRIES = 200
+JOURNAL_MAX_BYTES = 64 * 1024
+JOURNAL_MAX_AGE_S = 600
+
+
+def _serialize(settings: dict[str, Any]) -> bytes:
+    return json.dumps(settings, indent=4, ensure_ascii=False).encode('utf-8')
+
+
+def write_atomic(path: str, payload: bytes) -> None:
+    """写入同目录临时文件并 fsync 后替换目标文件，任何时刻磁盘上都不会出现写了一半的文件"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".timer_settings.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class _BackgroundWriter:
+    """
+    后台写入线程
+
+    按提交顺序执行写操作：完整快照会取代排在它之前、尚未执行的全部操作，
+    日志追加则依次执行；线程在首次提交时启动。
+    """
+
+    def __init__(self, path: str, journal_path: str, on_failure: Callable[[], None]):
+        self._path = path
+        self._journal_path = journal_path
+        self._on_failure = on_failure
+        self._cond = threading.Condition()
+        self._ops: list[tuple[str, bytes]] = []
+        self._busy = False
+        self._thread: threading.Thread | None = None
+
+    def submit_snapshot(self, payload: bytes) -> None:
+        with self._cond:
+            self._ops = [("snapshot", payload)]
+            self._start_locked()
+
+    def submit_journal(self, payload: bytes, truncate: bool) -> None:
+        with self._cond:
+            self._ops.append(("journal_new" if truncate else "journal", payload))
+            self._start_locked()
+
+    def _start_locked(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="settings-writer", daemon=True)
+            self._thread.start()
+        self._cond.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """等待已提交的操作全部写出；超时返回 False"""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._ops and not self._busy, timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: bool(self._ops))
+                kind, payload = self._ops.pop(0)
+                self._busy = True
+            try:
+                if kind == "snapshot":
+                    write_atomic(self._path, payload)
+                    # 日志中的改动都已包含在快照里；即使删除前崩溃，旧日志的基准也与新文件不符，加载时会被忽略
+                    try:
+                        os.remove(self._journal_path)
+                    except FileNotFoundError:
+                        pass
+                    logger.debug("Settings written to %s", self._path)
+                else:
+                    with open(self._journal_path, 'wb' if kind == "journal_new" else 'ab') as f:
+                        f.write(payload)
+                        f.flush()
+                        os.fsync(f.fileno())
+            except Exception as e:
+                logger.error("Failed to save settings: %s", e)
+                self._on_failure()
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+
+class SettingsRepository:
+    """
+    设置文件仓库
+
+    启动阶段只读取并解析一次 timer_settings.json（及其改动日志），语言加载
+    （app / TimerWindow.get_language）与 TimerWindow.load_settings 共享同一份解析结果。
+
+    写入分两种，都在后台线程执行，不阻塞事件循环：
+    - append()：把键级改动追加到 timer_settings.journal，磁盘开销与改动大小成正比
+    - save()：压缩，完整快照以临时文件 + fsync + 替换的方式写入并清空日志；
+      内容与上次写入相同且日志为空时跳过
+    日志首行记录其所基于的设置文件内容哈希，与磁盘上的设置文件不符时整体忽略。
+    """
+
+    def __init__(self, settings_file: str):
+        self.settings_file = settings_file
+        self.journal_file = os.path.splitext(settings_file)[0] + ".journal"
+        self._data: dict[str, Any] | None = None
+        self._loaded = False
+        self._last_digest: bytes | None = None
+        self._base_hex: str | None = None  # 磁盘上设置文件内容的哈希，日志据此判断是否有效
+        self._journal_entries = 0
+        self._journal_bytes = 0
+        self._journal_started = 0.0  # 日志首条改动的时间（time.time()，写入日志首行）
+        self._journal_fresh = True  # 下一次追加需要重写日志（写入首行基准）
+        self._compaction_required = False
+        self._writer = _BackgroundWriter(settings_file, self.journal_file, self._on_write_failed)
+
+    def _read(self) -> dict[str, Any] | None:
+        if not self._loaded:
+            self._loaded = True
+            try:
+                with open(self.settings_file, 'rb') as f:
+                    raw = f.read()
+                data = json.loads(raw.decode('utf-8'))
+                self._data = data if isinstance(data, dict) else None
+                if self._data is None:
+                    logger.warning("settings file is not a JSON object, ignored: %s", self.settings_file)
+                else:
+                    self._base_hex = hashlib.sha256(raw).hexdigest()
+                    self._replay_journal(self._data)
+                    if self._journal_entries == 0:
+                        # 以规范序列化结果作为基准，内容未变的首次保存也会被跳过
+                        self._last_digest = hashlib.sha256(_serialize(self._data)).digest()
+            except FileNotFoundError:
+                self._data = None
+            except Exception:
+                logger.exception("failed to read settings file %s", self.settings_file)
+                self._data = None
+        return self._data
+
+    def _replay_journal(self, data: dict[str, Any]) -> None:
+        """把与当前设置文件匹配的改动日志重放到 data 上"""
+        try:
+            with open(self.journal_file, 'rb') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.warning("failed to read settings journal: %s", e)
+            return
+        try:
+            header = json.loads(lines[0]) if lines else None
+        except ValueError:
+            header = None
+        if not isinstance(header, dict) or header.get("base") != self._base_hex:
+            logger.info("Ignoring stale settings journal %s", self.journal_file)
+            return
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+                data.update(entry.get("set", {}))
+                for key in entry.get("del", []):
+                    data.pop(key, None)
+            except (ValueError, AttributeError, TypeError):
+                # 末尾可能是写了一半的行：之后的追加不能接在它后面，下一次保存时压缩
+                logger.warning("Truncated settings journal, will compact on next save")
+                self._compaction_required = True
+                break
+            self._journal_entries += 1
+        self._journal_bytes = sum(len(line) + 1 for line in lines)
+        # 旧版日志首行没有创建时间，按已过期处理，下一次保存即压缩
+        created = header.get("created")
+        self._journal_started = float(created) if isinstance(created, (int, float)) and not isinstance(created, bool) else 0.0
+        self._journal_fresh = False
+
+    def exists(self) -> bool:
+        """设置文件存在且可以解析"""
+        return self._read() is not None
+
+    def load(self) -> dict[str, Any] | None:
+        """返回解析结果的副本（文件不存在或无法解析时为 None）"""
+        data = self._read()
+        return copy.deepcopy(data) if data is not None else None
+
+    def language(self) -> str:
+        data = self._read()
+        language = data.get('language') if data is not None else None
+        return language if language in SUPPORTED_LANGUAGES else 'zh_CN'
+
+    def needs_compaction(self) -> bool:
+        """日志过大、过旧或已损坏时应改为 save() 写完整快照"""
+        if self._compaction_required:
+            return True
+        if self._journal_entries == 0:
+            return False
+        return (
+            self._journal_entries >= JOURNAL_MAX_ENTRIES
+            or self._journal_bytes >= JOURNAL_MAX_BYTES
+            or abs(time.time() - self._journal_started) >= JOURNAL_MAX_AGE_S
+        )
+
+    def append(self, changes: dict[str, Any], removed: Iterable[str] = ()) -> bool:
+        """
+        追加一条键级改动
+
+        设置文件尚不存在（没有可作为基准的快照）时返回 False，调用方应改用 save()。
+        """
+        if self._base_hex is None or self._data is None:
+            return False
+        line = json.dumps({"set": changes, "del": sorted(removed)}, ensure_ascii=False, separators=(',', ':'))
+        entry = json.loads(line)
+        payload = (line + "\n").encode('utf-8')
+        truncate = self._journal_fresh
+        if truncate:
+            self._journal_started = time.time()
+            header = {"base": self._base_hex, "created": self._journal_started}
+            payload = (json.dumps(header) + "\n").encode('utf-8') + payload
+            self._journal_fresh = False
+            self._journal_bytes = 0
+        self._data.update(entry["set"])
+        for key in entry["del"]:
+            self._data.pop(key, None)
+        self._journal_entries += 1
+        self._journal_bytes += len(payload)
+        self._last_digest = None
+        self._writer.submit_journal(payload, truncate)
+        return True
+
+    def save(self, settings: dict[str, Any]) -> bool:
+        """
+        写入完整快照并清空改动日志（压缩）
+
+        内容与上次写入相同且没有日志时直接返回 False；否则交给后台线程写入并返回 True。
+        之后的读取直接使用该快照，不必等待写入完成。
+        """
+        payload = _serialize(settings)
+        digest = hashlib.sha256(payload).digest()
+        if digest == self._last_digest and self._journal_entries == 0 and not self._compaction_required:
+            return False
+        self._last_digest = digest
+        self._base_hex = hashlib.sha256(payload).hexdigest()
+        self._data = json.loads(payload)
+        self._loaded = True
+        self._journal_entries = 0
+        self._journal_bytes = 0
+        self._journal_fresh = True
+        self._compaction_required = False
+        self._writer.submit_snapshot(payload)
+        return True
+
+    def _on_write_failed(self) -> None:
+        # 在写入线程中调用：丢弃基准并要求下一次保存写完整快照
+        self._last_digest = None
+        self._compaction_required = True
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """等待后台写入完成（退出前调用）"""
+        return self._writer.flush(timeout)
+
+
+_repositories: dict[str, SettingsRepository] = {}
+
+
+def get_settings_repository(base_path: str | None = None) -> SettingsRepository:
+    """按设置文件路径共享仓库实例"""
+    base_path = base_path or get_base_path()
+    settings_file = os.path.join(base_path, "settings", "timer_settings.json")
+    repository = _repositories.get(settings_file)
+    if repository is None:
+        repository = SettingsRepository(settings_file)
+        _repositories[settings_file] = repository
+    return repository
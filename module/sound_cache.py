@@ -0,0 +1,267 @@
+import array
+import hashlib
+import logging
+import os
+import sys
+import wave
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from PyQt6.QtCore import QObject, QTimer, QUrl, pyqtSignal
+
+if TYPE_CHECKING:
+    from PyQt6.QtMultimedia import QAudioDecoder
+
+logger = logging.getLogger(__name__)
+
+# 需要先解码为 PCM WAV 的压缩格式
+COMPRESSED_EXTENSIONS = frozenset({'.mp3', '.ogg', '.m4a', '.flac'})
+
+# 缓存总大小上限，超出后按最近使用时间淘汰
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# 统一解码为 16 位有符号 PCM
+_SAMPLE_WIDTH = 2
+
+# 解码器超过该时间既没有新数据也没有结束时放弃当前文件，避免后续请求一直排队
+DECODE_TIMEOUT_MS = 10_000
+
+
+def cache_key(path: str, mtime_ns: int, size: int) -> str:
+    """缓存文件名：源文件路径、修改时间与大小任一变化都会得到新文件"""
+    source = f"{os.path.normcase(os.path.abspath(path))}|{mtime_ns}|{size}"
+    return hashlib.sha1(source.encode('utf-8')).hexdigest() + '.wav'
+
+
+def _to_int16(data: bytes, sample_format) -> bytes:
+    """
+    返回一段解码后样本的 16 位有符号小端 PCM
+
+    解码器已通过 setAudioFormat() 要求输出 Int16，其他格式视为解码失败（铃声仍由 QMediaPlayer 播放原文件），
+    不在 GUI 线程逐个样本转换。
+    """
+    from PyQt6.QtMultimedia import QAudioFormat
+
+    if sample_format != QAudioFormat.SampleFormat.Int16:
+        raise ValueError(f"unexpected sample format: {sample_format}")
+    if sys.byteorder == 'little':
+        return data
+    samples = array.array('h', data)
+    samples.byteswap()
+    return samples.tobytes()
+
+
+class PcmCache(QObject):
+    """
+    压缩铃声的 PCM 缓存（settings/sound_cache/）
+
+    MP3 / OGG / M4A / FLAC 铃声在后台用 QAudioDecoder 解码一次，写成 16 位 PCM WAV，
+    文件名由源路径、修改时间与大小决定；响铃时只播放解码好的 WAV。
+    缓存总大小超过上限时按最近使用时间（缓存文件的修改时间）淘汰最久未用的文件。
+    同一时间只解码一个文件，其余请求排队。
+    """
+
+    ready = pyqtSignal(str, str)  # 源文件路径, 缓存的 WAV 路径
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES, parent=None):
+        super().__init__(parent)
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        # 缓存文件名 -> 大小，按最近使用排列（末尾最新）；首次使用时从磁盘读取
+        self._lru: OrderedDict[str, int] | None = None
+        self._queue: list[str] = []
+        self._decoder: "QAudioDecoder | None" = None
+        self._current: tuple[str, str] | None = None  # (源文件, 缓存文件名)
+        self._writer: wave.Wave_write | None = None
+        self._tmp_path: str | None = None
+        self._watchdog = QTimer(self)
+        self._watchdog.setSingleShot(True)
+        self._watchdog.setInterval(DECODE_TIMEOUT_MS)
+        self._watchdog.timeout.connect(self._on_timeout)
+
+    @staticmethod
+    def needs_decode(path: str) -> bool:
+        return os.path.splitext(path)[1].lower() in COMPRESSED_EXTENSIONS
+
+    def _entries(self) -> OrderedDict[str, int]:
+        if self._lru is None:
+            found = []
+            try:
+                with os.scandir(self.cache_dir) as it:
+                    for entry in it:
+                        if entry.name.endswith('.wav.tmp'):
+                            # 上次退出时未写完的文件
+                            try:
+                                os.unlink(entry.path)
+                            except OSError:
+                                pass
+                            continue
+                        if entry.name.endswith('.wav') and entry.is_file():
+                            stat = entry.stat()
+                            found.append((stat.st_mtime, entry.name, stat.st_size))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning("Failed to read sound cache: %s", e)
+            self._lru = OrderedDict((name, size) for _mtime, name, size in sorted(found))
+        return self._lru
+
+    def _key_for(self, path: str) -> str | None:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return cache_key(path, stat.st_mtime_ns, stat.st_size)
+
+    def lookup(self, path: str) -> str | None:
+        """返回已缓存的 WAV 路径并标记为最近使用；尚未缓存时返回 None"""
+        key = self._key_for(path)
+        entries = self._entries()
+        if key is None or key not in entries:
+            return None
+        cached = os.path.join(self.cache_dir, key)
+        try:
+            os.utime(cached)
+        except OSError:
+            # 缓存文件已被外部删除
+            del entries[key]
+            return None
+        entries.move_to_end(key)
+        return cached
+
+    def request(self, path: str) -> str | None:
+        """已缓存时返回 WAV 路径，否则排队解码，完成后发出 ready"""
+        cached = self.lookup(path)
+        if cached is not None:
+            return cached
+        if path not in self._queue and (self._current is None or self._current[0] != path):
+            self._queue.append(path)
+            self._start_next()
+        return None
+
+    def _start_next(self) -> None:
+        while self._current is None and self._queue:
+            path = self._queue.pop(0)
+            key = self._key_for(path)
+            if key is None:
+                continue
+            if key in self._entries():
+                self.ready.emit(path, os.path.join(self.cache_dir, key))
+                continue
+            self._begin(path, key)
+
+    def _begin(self, path: str, key: str) -> None:
+        if self._decoder is None:
+            # 与 AlarmPlayer 一样按需导入 QtMultimedia，不占用启动时间
+            from PyQt6.QtMultimedia import QAudioDecoder, QAudioFormat
+
+            self._decoder = QAudioDecoder(self)
+            target = QAudioFormat()
+            target.setSampleFormat(QAudioFormat.SampleFormat.Int16)
+            self._decoder.setAudioFormat(target)
+            self._decoder.bufferReady.connect(self._on_buffer)
+            self._decoder.finished.connect(self._on_finished)
+            # PyQt6 中 error 是信号（取值方法被同名信号覆盖）
+            self._decoder.error.connect(self._on_error)
+        self._current = (path, key)
+        self._writer = None
+        self._tmp_path = None
+        logger.debug("decoding %s into sound cache", path)
+        self._decoder.setSource(QUrl.fromLocalFile(path))
+        self._watchdog.start()
+        self._decoder.start()
+
+    def _on_buffer(self) -> None:
+        buffer = self._decoder.read()
+        if not buffer.isValid() or self._current is None:
+            return
+        # 有进展就重新计时，超时只针对卡住的解码
+        self._watchdog.start()
+        fmt = buffer.format()
+        try:
+            if self._writer is None:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                self._tmp_path = os.path.join(self.cache_dir, self._current[1] + '.tmp')
+                self._writer = wave.open(self._tmp_path, 'wb')
+                self._writer.setnchannels(fmt.channelCount())
+                self._writer.setsampwidth(_SAMPLE_WIDTH)
+                self._writer.setframerate(fmt.sampleRate())
+            data = buffer.constData().asstring(buffer.byteCount())
+            self._writer.writeframesraw(_to_int16(data, fmt.sampleFormat()))
+        except (OSError, ValueError, wave.Error) as e:
+            self._fail(str(e))
+
+    def _on_finished(self) -> None:
+        if self._current is None:
+            return
+        self._watchdog.stop()
+        path, key = self._current
+        writer, tmp_path = self._writer, self._tmp_path
+        self._writer = None
+        if writer is None or tmp_path is None:
+            self._fail("no audio decoded")
+            return
+        cached = os.path.join(self.cache_dir, key)
+        try:
+            writer.close()
+            os.replace(tmp_path, cached)
+            size = os.path.getsize(cached)
+        except (OSError, wave.Error) as e:
+            self._fail(str(e))
+            return
+        entries = self._entries()
+        entries[key] = size
+        entries.move_to_end(key)
+        self._evict(keep=key)
+        self._current = None
+        self._tmp_path = None
+        logger.debug("sound cached: %s -> %s (%d bytes)", path, key, size)
+        self.ready.emit(path, cached)
+        self._start_next()
+
+    def _on_error(self, _error=None) -> None:
+        self._fail(self._decoder.errorString() if self._decoder is not None else "decoder error")
+
+    def _on_timeout(self) -> None:
+        self._fail(f"no progress for {DECODE_TIMEOUT_MS} ms")
+
+    def _fail(self, reason: str) -> None:
+        self._watchdog.stop()
+        if self._current is None:
+            return
+        path = self._current[0]
+        self._current = None
+        if self._decoder is not None:
+            self._decoder.stop()
+        if self._writer is not None:
+            try:
+                self._writer.close()
+            except (OSError, wave.Error):
+                pass
+            self._writer = None
+        if self._tmp_path is not None:
+            try:
+                os.unlink(self._tmp_path)
+            except OSError:
+                pass
+            self._tmp_path = None
+        logger.warning("Failed to decode sound %s: %s", path, reason)
+        self._start_next()
+
+    def _evict(self, keep: str | None = None) -> None:
+        entries = self._entries()
+        total = sum(entries.values())
+        for key in list(entries):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            try:
+                os.unlink(os.path.join(self.cache_dir, key))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning("Failed to evict cached sound %s: %s", key, e)
+                continue
+            total -= entries.pop(key)
+            logger.debug("evicted cached sound %s", key)
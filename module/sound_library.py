@@ -0,0 +1,333 @@
+import json
+import logging
+import os
+import random
+import wave
+from typing import Any, NamedTuple
+
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+from .loudness import analyze_wav
+from .settings_store import write_atomic
+
+logger = logging.getLogger(__name__)
+
+# 支持的音频格式
+AUDIO_EXTENSIONS = frozenset({'.wav', '.mp3', '.ogg', '.m4a', '.flac'})
+
+# 目录变化通知往往成串到达（复制多个文件、写入大文件），合并后再重新扫描
+_RESCAN_DELAY_MS = 200
+# 分析结果合并后再写入索引文件，连续分析多个文件时只写一次
+_SAVE_DELAY_MS = 1000
+
+
+class SoundInfo(NamedTuple):
+    path: str
+    format: str  # 小写扩展名，不含点
+    size: int
+    mtime: float
+    duration: float | None  # 秒；未读取或无法读取时为 None
+    rms_db: float | None = None  # RMS 响度（dBFS），未分析时为 None
+    peak_db: float | None = None  # 峰值（dBFS）
+
+
+# 持久化到索引文件的分析结果
+_ANALYSIS_FIELDS = ('duration', 'rms_db', 'peak_db')
+_INDEX_VERSION = 1
+
+
+def _key(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _wav_duration(path: str) -> float | None:
+    try:
+        with wave.open(path, 'rb') as wav:
+            rate = wav.getframerate()
+            return wav.getnframes() / rate if rate else None
+    except (OSError, EOFError, wave.Error):
+        return None
+
+
+class _AnalysisTask(QRunnable):
+    """在线程池中分析一个 PCM WAV 的响度，结果通过 SoundLibrary 的信号送回 GUI 线程"""
+
+    def __init__(self, library: "SoundLibrary", path: str, pcm_path: str, stamp: tuple):
+        super().__init__()
+        self._library = library
+        self._path = path
+        self._pcm_path = pcm_path
+        self._stamp = stamp
+
+    def run(self) -> None:
+        levels = analyze_wav(self._pcm_path)
+        try:
+            self._library._analyzed.emit(self._path, self._stamp, levels)
+        except RuntimeError:
+            # 分析期间 SoundLibrary 已被销毁（退出应用）
+            pass
+
+
+class SoundLibrary(QObject):
+    """
+    铃声库（sounds 文件夹索引）
+
+    首次使用时扫描一次文件夹，在内存中保存每个音频文件的路径、格式、大小、修改时间；
+    时长（目前只读取 WAV）在第一次查询该文件时读取。之后由 QFileSystemWatcher
+    通知目录变化，只更新新增、删除或大小 / 修改时间变化的文件。
+    contains() 与 random_choice() 都是 O(1)，响铃时不再访问磁盘。
+
+    响度在线程池中分析，完成后发出 loudness_ready(path)；分析完成前 loudness() 返回 None。
+    时长与响度分析结果延迟合并写入索引文件（index_path），退出前由 flush() 写入尚未保存的结果；
+    大小与修改时间未变的文件下次启动时直接复用，不再重新分析。
+    """
+
+    changed = pyqtSignal()
+    loudness_ready = pyqtSignal(str)  # 铃声路径
+    _analyzed = pyqtSignal(str, object, object)  # 铃声路径, 分析时的 (键, 大小, 修改时间), (RMS, 峰值) 或 None
+
+    def __init__(self, sounds_dir: str, index_path: str | None = None, parent=None):
+        super().__init__(parent)
+        self.sounds_dir = os.path.abspath(sounds_dir)
+        self._dir_key = _key(self.sounds_dir)
+        self._index_path = index_path
+        self._entries: dict[str, SoundInfo] = {}
+        # sounds 文件夹外的文件（用户选择的外部铃声）只在内存中记录响度
+        self._external_levels: dict[tuple[str, int, float], tuple[float, float] | None] = {}
+        # 正在分析、以及无法分析的文件，按 (键, 大小, 修改时间) 记录，避免重复提交
+        self._analyzing: set[tuple[str, int, float]] = set()
+        self._unreadable: set[tuple[str, int, float]] = set()
+        self._analyzed.connect(self._on_analyzed)
+        # 路径数组与 键 -> 下标，删除时与末尾交换，随机选择与删除都是 O(1)
+        self._paths: list[str] = []
+        self._slots: dict[str, int] = {}
+        self._scanned = False
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._schedule_rescan)
+        self._rescan_timer = QTimer(self)
+        self._rescan_timer.setSingleShot(True)
+        self._rescan_timer.setInterval(_RESCAN_DELAY_MS)
+        self._rescan_timer.timeout.connect(self.rescan)
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(_SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self._save_index)
+
+    def ensure_folder(self) -> None:
+        """创建 sounds 文件夹（如不存在）并开始监视"""
+        try:
+            os.makedirs(self.sounds_dir, exist_ok=True)
+        except OSError as e:
+            logger.error("Failed to create sounds folder: %s", e)
+            return
+        self._watch()
+
+    def _watch(self) -> None:
+        if os.path.isdir(self.sounds_dir) and self.sounds_dir not in self._watcher.directories():
+            self._watcher.addPath(self.sounds_dir)
+
+    def _ensure_scanned(self) -> None:
+        if not self._scanned:
+            self.rescan()
+
+    def _schedule_rescan(self, _path: str = "") -> None:
+        self._rescan_timer.start()
+
+    def _scan_dir(self) -> dict[str, tuple[str, str, int, float]]:
+        found = {}
+        try:
+            with os.scandir(self.sounds_dir) as it:
+                for entry in it:
+                    ext = os.path.splitext(entry.name)[1].lower()
+                    if ext not in AUDIO_EXTENSIONS:
+                        continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    found[_key(entry.path)] = (entry.path, ext[1:], stat.st_size, stat.st_mtime)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error("Failed to read sounds folder: %s", e)
+        return found
+
+    def _load_index(self) -> dict[str, dict[str, Any]]:
+        if not self._index_path:
+            return {}
+        try:
+            with open(self._index_path, encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Failed to read sound index: %s", e)
+            return {}
+        if not isinstance(data, dict) or data.get('version') != _INDEX_VERSION or not isinstance(data.get('files'), dict):
+            return {}
+        return data['files']
+
+    def _schedule_save(self) -> None:
+        if self._index_path:
+            self._save_timer.start()
+
+    def flush(self) -> None:
+        """立即写入尚未保存的分析结果（退出时调用）"""
+        if self._save_timer.isActive():
+            self._save_timer.stop()
+            self._save_index()
+
+    def _save_index(self) -> None:
+        if not self._index_path:
+            return
+        files = {}
+        for info in self._entries.values():
+            analysis = {field: getattr(info, field) for field in _ANALYSIS_FIELDS if getattr(info, field) is not None}
+            if analysis:
+                files[os.path.basename(info.path)] = {'size': info.size, 'mtime': info.mtime, **analysis}
+        payload = json.dumps({'version': _INDEX_VERSION, 'files': files}, ensure_ascii=False, indent=1)
+        try:
+            write_atomic(self._index_path, payload.encode('utf-8'))
+        except OSError as e:
+            logger.warning("Failed to save sound index: %s", e)
+
+    @staticmethod
+    def _restore(info: SoundInfo, record: Any) -> SoundInfo:
+        """大小与修改时间都与索引文件中的记录相同时，复用记录中的分析结果"""
+        if not isinstance(record, dict) or record.get('size') != info.size or record.get('mtime') != info.mtime:
+            return info
+        analysis = {}
+        for field in _ANALYSIS_FIELDS:
+            value = record.get(field)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                analysis[field] = float(value)
+        return info._replace(**analysis)
+
+    def rescan(self) -> bool:
+        """与磁盘同步索引，只更新变化的文件；返回索引是否变化"""
+        first = not self._scanned
+        self._scanned = True
+        self._watch()
+        found = self._scan_dir()
+        records = self._load_index() if first else {}
+        changed = False
+        for key in [key for key in self._entries if key not in found]:
+            self._remove(key)
+            changed = True
+        for key, (path, fmt, size, mtime) in found.items():
+            old = self._entries.get(key)
+            if old is not None and old.size == size and old.mtime == mtime:
+                continue
+            info = SoundInfo(path, fmt, size, mtime, None)
+            self._entries[key] = self._restore(info, records.get(os.path.basename(path))) if records else info
+            if old is None:
+                self._slots[key] = len(self._paths)
+                self._paths.append(path)
+            changed = True
+        if changed:
+            logger.debug("sound library %s: %d files", "scanned" if first else "updated", len(self._paths))
+            if not first:
+                self.changed.emit()
+        return changed
+
+    def _remove(self, key: str) -> None:
+        del self._entries[key]
+        slot = self._slots.pop(key)
+        last = self._paths.pop()
+        if slot < len(self._paths):
+            self._paths[slot] = last
+            self._slots[_key(last)] = slot
+
+    def in_folder(self, path: str) -> bool:
+        return os.path.dirname(_key(path)) == self._dir_key
+
+    def contains(self, path: str) -> bool:
+        self._ensure_scanned()
+        return _key(path) in self._entries
+
+    def exists(self, path: str) -> bool:
+        """
+        铃声文件是否存在
+
+        sounds 文件夹内的文件查索引，用户选择的外部文件仍检查磁盘。
+        """
+        if not path:
+            return False
+        if self.in_folder(path):
+            return self.contains(path)
+        return os.path.isfile(path)
+
+    def info(self, path: str, analyze: bool = True) -> SoundInfo | None:
+        """返回文件的索引信息，第一次查询时补充时长；analyze 为 False 时不读取文件"""
+        self._ensure_scanned()
+        key = _key(path)
+        info = self._entries.get(key)
+        if analyze and info is not None and info.duration is None and info.format == 'wav':
+            duration = _wav_duration(info.path)
+            if duration is not None:
+                info = self._entries[key] = info._replace(duration=duration)
+                self._schedule_save()
+        return info
+
+    def loudness(self, path: str, pcm_path: str | None = None, analyze: bool = True) -> tuple[float, float] | None:
+        """
+        返回已分析的 (RMS, 峰值) 响度（dBFS）
+
+        尚未分析时返回 None，并在 analyze 为 True 时把分析提交到线程池，完成后发出 loudness_ready。
+        pcm_path 为实际播放的 PCM WAV（压缩格式铃声为 PcmCache 中的文件），默认为 path 本身；
+        尚无可分析的 WAV 时返回 None。
+        """
+        pcm_path = pcm_path or path
+        if os.path.splitext(pcm_path)[1].lower() != '.wav':
+            return None
+        if self.in_folder(path):
+            info = self.info(path, analyze)
+            if info is None:
+                return None
+            if info.rms_db is not None and info.peak_db is not None:
+                return info.rms_db, info.peak_db
+            stamp = (_key(path), info.size, info.mtime)
+        else:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return None
+            stamp = (_key(path), stat.st_size, stat.st_mtime)
+            if stamp in self._external_levels:
+                return self._external_levels[stamp]
+        if analyze and stamp not in self._analyzing and stamp not in self._unreadable:
+            self._analyzing.add(stamp)
+            QThreadPool.globalInstance().start(_AnalysisTask(self, path, pcm_path, stamp))
+        return None
+
+    def _on_analyzed(self, path: str, stamp: tuple, levels: tuple[float, float] | None) -> None:
+        self._analyzing.discard(stamp)
+        key, size, mtime = stamp
+        if levels is None:
+            self._unreadable.add(stamp)
+            return
+        info = self._entries.get(key)
+        if info is not None and (info.size, info.mtime) == (size, mtime):
+            self._entries[key] = info._replace(rms_db=levels[0], peak_db=levels[1])
+            self._schedule_save()
+        elif info is None and not self.in_folder(path):
+            self._external_levels[stamp] = levels
+        else:
+            # 分析期间文件已变化或被删除
+            return
+        logger.debug("analyzed %s: rms %.1f dBFS, peak %.1f dBFS", os.path.basename(path), *levels)
+        self.loudness_ready.emit(path)
+
+    def random_choice(self) -> str | None:
+        self._ensure_scanned()
+        return random.choice(self._paths) if self._paths else None
+
+    def files(self) -> list[str]:
+        self._ensure_scanned()
+        return list(self._paths)
+
+    def __len__(self) -> int:
+        self._ensure_scanned()
+        return len(self._paths)
@@ -0,0 +1,175 @@
+from collections import OrderedDict
+from typing import NamedTuple
+
+from PyQt6.QtCore import QEvent, QRect, QRectF, QSize, Qt
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPainterPath, QPixmap
+from PyQt6.QtWidgets import QWidget
+
+
+class FaceStyle(NamedTuple):
+    """绘制式表盘的样式（对应 QLabel 样式表中的同名属性）"""
+
+    text_color: str
+    bg_rgba: tuple[int, int, int, int]
+    corner_radius: int
+    padding: tuple[int, int]  # (上下, 左右)
+
+
+class GlyphAtlas:
+    """
+    单字符位图缓存
+
+    按 (字体, 字号, 粗细, 颜色, 设备像素比) 分页，每页缓存已渲染过的字符；
+    页数有上限，超出时淘汰最久未使用的一页。
+    """
+
+    MAX_SHEETS = 8
+
+    def __init__(self):
+        self._sheets: OrderedDict[tuple, dict[str, QPixmap]] = OrderedDict()
+
+    @staticmethod
+    def _sheet_key(font: QFont, color: str, dpr: float) -> tuple:
+        return (font.family(), font.pointSize(), font.pixelSize(), font.weight(), color, dpr)
+
+    def glyph(self, font: QFont, color: str, dpr: float, char: str, cell_width: int) -> QPixmap:
+        key = self._sheet_key(font, color, dpr)
+        sheet = self._sheets.get(key)
+        if sheet is None:
+            sheet = {}
+            self._sheets[key] = sheet
+            while len(self._sheets) > self.MAX_SHEETS:
+                self._sheets.popitem(last=False)
+        else:
+            self._sheets.move_to_end(key)
+        pixmap = sheet.get(char)
+        if pixmap is None:
+            pixmap = self._render(font, color, dpr, char, cell_width)
+            sheet[char] = pixmap
+        return pixmap
+
+    @staticmethod
+    def _render(font: QFont, color: str, dpr: float, char: str, cell_width: int) -> QPixmap:
+        metrics = QFontMetrics(font)
+        pixmap = QPixmap(max(1, round(cell_width * dpr)), max(1, round(metrics.height() * dpr)))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+        painter.setFont(font)
+        painter.setPen(QColor(color))
+        # 字符在单元格内居中，数字按最宽数字等宽排列，不会左右抖动
+        painter.drawText(QRectF(0, 0, cell_width, metrics.height()), Qt.AlignmentFlag.AlignCenter, char)
+        painter.end()
+        return pixmap
+
+
+_shared_atlas = GlyphAtlas()
+
+
+class TimerFace(QWidget):
+    """
+    绘制式时间显示控件
+
+    与 QLabel 保持相同的 setText / text / setFont / adjustSize 用法；
+    字符从 GlyphAtlas 取位图绘制，文本变化时只重绘内容发生变化的字符单元。
+    """
+
+    def __init__(self, text: str = "", parent: QWidget | None = None):
+        super().__init__(parent)
+        self._text = text
+        self._style = FaceStyle("#E0E0E0", (0, 0, 0, 0), 0, (0, 0))
+        self._cells: list[tuple[int, int]] = []  # 每个字符单元的 (x 偏移, 宽度)，相对内容区
+        self._content_width = 0
+        self._line_height = 0
+        self._digit_width = 0
+        self._metrics = QFontMetrics(self.font())
+        self._update_metrics()
+
+    def text(self) -> str:
+        return self._text
+
+    def setText(self, text: str) -> None:
+        if text == self._text:
+            return
+        old_text = self._text
+        old_cells = self._cells
+        self._text = text
+        self._layout_cells()
+        if self._cells != old_cells:
+            # 单元布局改变（长度或非数字字符宽度变化），整体重绘并通知尺寸变化
+            self.updateGeometry()
+            self.update()
+            return
+        origin_x, origin_y = self._content_origin()
+        for index, (offset, width) in enumerate(self._cells):
+            if old_text[index] != text[index]:
+                self.update(QRect(origin_x + offset, origin_y, width, self._line_height))
+
+    def set_face_style(self, style: FaceStyle) -> None:
+        if style == self._style:
+            return
+        padding_changed = style.padding != self._style.padding
+        self._style = style
+        if padding_changed:
+            self.updateGeometry()
+        self.update()
+
+    def sizeHint(self) -> QSize:
+        vertical, horizontal = self._style.padding
+        return QSize(self._content_width + horizontal * 2, self._line_height + vertical * 2)
+
+    def minimumSizeHint(self) -> QSize:
+        return self.sizeHint()
+
+    def changeEvent(self, a0):
+        if a0 is not None and a0.type() == QEvent.Type.FontChange:
+            self._update_metrics()
+            self.updateGeometry()
+            self.update()
+        super().changeEvent(a0)
+
+    def paintEvent(self, a0):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        r, g, b, a = self._style.bg_rgba
+        if a > 0:
+            path = QPainterPath()
+            radius = self._style.corner_radius
+            path.addRoundedRect(QRectF(self.rect()), radius, radius)
+            painter.fillPath(path, QColor(r, g, b, a))
+
+        dirty = a0.rect() if a0 is not None else self.rect()
+        origin_x, origin_y = self._content_origin()
+        font = self.font()
+        dpr = self.devicePixelRatioF()
+        for char, (offset, width) in zip(self._text, self._cells):
+            cell = QRect(origin_x + offset, origin_y, width, self._line_height)
+            if not cell.intersects(dirty):
+                continue
+            pixmap = _shared_atlas.glyph(font, self._style.text_color, dpr, char, width)
+            painter.drawPixmap(cell.topLeft(), pixmap)
+        painter.end()
+
+    def _update_metrics(self) -> None:
+        self._metrics = QFontMetrics(self.font())
+        self._line_height = self._metrics.height()
+        self._digit_width = max(self._metrics.horizontalAdvance(d) for d in "0123456789")
+        self._layout_cells()
+
+    def _layout_cells(self) -> None:
+        cells = []
+        x = 0
+        for char in self._text:
+            width = self._digit_width if char.isdigit() else self._metrics.horizontalAdvance(char)
+            cells.append((x, width))
+            x += width
+        self._cells = cells
+        self._content_width = x
+
+    def _content_origin(self) -> tuple[int, int]:
+        """内容区左上角：在控件内居中（全屏时控件远大于内容）"""
+        return (
+            (self.width() - self._content_width) // 2,
+            (self.height() - self._line_height) // 2,
+        )
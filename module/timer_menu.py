@@ -0,0 +1,341 @@
+import logging
+from typing import TYPE_CHECKING, Any
+
+from PyQt6.QtCore import QMargins, QPoint
+from PyQt6.QtGui import QAction
+from PyQt6.QtWidgets import QWidget
+from qfluentwidgets import (
+    CheckableMenu,
+    CheckableSystemTrayMenu,
+    FluentIcon,
+    MenuAnimationManager,
+    MenuAnimationType,
+    RoundMenu,
+    SystemTrayMenu,
+)
+
+from .preset_store import increasing_subset
+
+if TYPE_CHECKING:
+    from .timer_window import TimerWindow
+
+logger = logging.getLogger(__name__)
+
+_UNSET = object()
+
+
+class _InstantMenuMixin:
+    """
+    弹出（包括子菜单）不播放动画，子菜单悬停即展开
+
+    RoundMenu.exec() 与菜单列表的 adjustSize() 每次调用都会通过 MenuAnimationManager.make()
+    新建动画管理器，其位置动画挂在菜单 / 列表下不会释放；即时菜单及其列表各复用一个无动画管理器
+    （见 _reused_none_manager）。
+    """
+
+    def __init__(self, title: str = "", parent: QWidget | None = None):
+        super().__init__(title, parent)  # type: ignore[call-arg]
+        timer = getattr(self, "timer", None)
+        if timer is not None:
+            try:
+                timer.setInterval(0)
+            except Exception:
+                pass
+
+    def exec(self, pos, ani=True, aniType=MenuAnimationType.DROP_DOWN):
+        return super().exec(pos, ani=False, aniType=MenuAnimationType.NONE)  # type: ignore[misc]
+
+
+def _install_reused_none_manager() -> None:
+    """替换 MenuAnimationManager 注册表中的无动画管理器：即时菜单与其列表复用同一个实例，其他菜单不变"""
+    managers = getattr(MenuAnimationManager, 'managers', None)
+    create = managers.get(MenuAnimationType.NONE) if isinstance(managers, dict) else None
+    if getattr(create, '_reused', False):
+        return
+    if create is None:
+        logger.warning("MenuAnimationManager registry not found, menu animations are not reused")
+        return
+
+    def _reused_none_manager(widget):
+        owner = widget if isinstance(widget, _InstantMenuMixin) else widget.parent()
+        if not isinstance(owner, _InstantMenuMixin):
+            return create(widget)
+        manager = getattr(widget, '_none_animation_manager', None)
+        if manager is None:
+            manager = widget._none_animation_manager = create(widget)
+        return manager
+
+    _reused_none_manager._reused = True
+    managers[MenuAnimationType.NONE] = _reused_none_manager
+
+
+_install_reused_none_manager()
+
+
+class InstantRoundMenu(_InstantMenuMixin, RoundMenu):
+    pass
+
+
+class InstantCheckableMenu(_InstantMenuMixin, CheckableMenu):
+    pass
+
+
+class InstantSystemTrayMenu(_InstantMenuMixin, SystemTrayMenu):
+    pass
+
+
+class InstantCheckableSystemTrayMenu(_InstantMenuMixin, CheckableSystemTrayMenu):
+    pass
+
+
+def new_menu(parent: QWidget, title: str | None = None, *, is_tray: bool = False, checkable: bool = False) -> RoundMenu:
+    if is_tray:
+        menu_cls = InstantCheckableSystemTrayMenu if checkable else InstantSystemTrayMenu
+    else:
+        menu_cls = InstantCheckableMenu if checkable else InstantRoundMenu
+    return menu_cls(title or "", parent)
+
+
+class TimerMenu:
+    """
+    托盘菜单 / 右键菜单模型
+
+    菜单与其中的动作只在首次打开（或语言、主题变化）时构建一次；之后每次打开前
+    refresh() 只更新文本、图标、勾选与可用状态中真正变化的部分，
+    倒计时预设子菜单按预设 id 比较新旧列表，只增删、移动或改写变化的动作。
+    每个模型任何时候最多持有一棵菜单，反复打开不会产生新的菜单对象。
+    """
+
+    def __init__(self, window: "TimerWindow", *, is_tray: bool):
+        self._window = window
+        self._is_tray = is_tray
+        self.menu: RoundMenu | None = None
+        self._menus: list[RoundMenu] = []  # 根菜单与各级子菜单
+        self._lang_code: str | None = None
+        # 动作 -> 上次设置的 {属性: 值}，相同的值不再重复设置
+        self._applied: dict[QAction, dict[str, Any]] = {}
+        self._countdown_menu: RoundMenu | None = None
+        self._preset_actions: dict[str, QAction] = {}
+        self._preset_order: list[str] = []
+        self._synced_presets: list | None = None
+        self._placeholder: QAction | None = None
+
+    def invalidate(self) -> None:
+        """丢弃已构建的菜单（语言或主题变化后），下一次 refresh() 重新构建"""
+        # 子菜单的父对象是窗口而不是根菜单，需要逐个释放
+        for menu in self._menus:
+            menu.deleteLater()
+        self._menus = []
+        self.menu = None
+        self._applied.clear()
+        self._countdown_menu = None
+        self._preset_actions.clear()
+        self._preset_order = []
+        self._synced_presets = None
+        self._placeholder = None
+
+    def _action(self, text_key: str, slot, *, checkable: bool = False) -> QAction:
+        # 动作挂在根菜单下，随菜单一起销毁
+        action = QAction(self._window.tr(text_key), self.menu)
+        action.setCheckable(checkable)
+        action.triggered.connect(slot)
+        return action
+
+    def _build(self) -> None:
+        window = self._window
+        self.invalidate()
+        self._lang_code = window.l18n.lang_code
+        menu = new_menu(window, is_tray=self._is_tray)
+        self.menu = menu
+
+        self.pause_action = self._action('pause', window.toggle_pause)
+        menu.addAction(self.pause_action)
+        self.reset_action = self._action('reset', window.reset_timer)
+        menu.addAction(self.reset_action)
+
+        menu.addSeparator()
+        mode_menu = new_menu(window, window.tr('mode_switch_menu'), is_tray=self._is_tray, checkable=True)
+        mode_menu.setIcon(FluentIcon.MENU)
+        self.countup_action = self._action('count_up_mode', window.switch_to_count_up, checkable=True)
+        mode_menu.addAction(self.countup_action)
+        mode_menu.addSeparator()
+
+        countdown_menu = new_menu(window, window.tr('countdown_mode'), is_tray=self._is_tray)
+        countdown_menu.setIcon(FluentIcon.CALENDAR)
+        # 自定义倒计时放在预设之前，预设列表的增删都发生在菜单末尾一侧
+        self.custom_action = self._action('custom_countdown_once', window.prompt_custom_countdown)
+        countdown_menu.addAction(self.custom_action)
+        countdown_menu.addSeparator()
+        mode_menu.addMenu(countdown_menu)
+        self._countdown_menu = countdown_menu
+        self._menus = [menu, mode_menu, countdown_menu]
+        self.countdown_action = countdown_menu.menuAction()
+        if self.countdown_action is not None:
+            self.countdown_action.setCheckable(True)
+
+        mode_menu.addSeparator()
+        self.clock_action = self._action('clock_mode', window.switch_to_clock_mode, checkable=True)
+        mode_menu.addAction(self.clock_action)
+        menu.addMenu(mode_menu)
+
+        menu.addSeparator()
+        window_menu = new_menu(window, window.tr('window_menu'), is_tray=self._is_tray)
+        window_menu.setIcon(FluentIcon.VIEW)
+        self._menus.append(window_menu)
+        self.settings_action = self._action('settings', window.show_settings)
+        window_menu.addAction(self.settings_action)
+        self.visibility_action = self._action('show_hide', window.toggle_visibility)
+        window_menu.addAction(self.visibility_action)
+        self.fullscreen_action = self._action('enter_fullscreen', window.toggle_fullscreen)
+        window_menu.addAction(self.fullscreen_action)
+        self.lock_action = self._action('lock_window', window.toggle_lock)
+        window_menu.addAction(self.lock_action)
+        menu.addMenu(window_menu)
+
+        menu.addSeparator()
+        self.quit_action = self._action('quit', window.quit_app)
+        menu.addAction(self.quit_action)
+
+        for action, icon in (
+            (self.reset_action, FluentIcon.RETURN),
+            (self.countup_action, FluentIcon.STOP_WATCH),
+            (self.custom_action, FluentIcon.EDIT),
+            (self.clock_action, FluentIcon.DATE_TIME),
+            (self.settings_action, FluentIcon.SETTING),
+            (self.fullscreen_action, FluentIcon.FULL_SCREEN),
+            (self.quit_action, FluentIcon.POWER_BUTTON),
+        ):
+            self._set(action, icon=icon)
+
+    def _set(self, action: QAction | None, *, text=_UNSET, icon=_UNSET, enabled=_UNSET, checked=_UNSET) -> None:
+        """只设置与上次不同的属性；勾选状态与动作的当前状态比较（触发可勾选动作会自行切换）"""
+        if action is None:
+            return
+        applied = self._applied.setdefault(action, {})
+        if text is not _UNSET and applied.get('text') != text:
+            action.setText(text)
+            applied['text'] = text
+        if icon is not _UNSET and applied.get('icon') is not icon:
+            self._window._apply_action_icon(action, icon)
+            applied['icon'] = icon
+        if enabled is not _UNSET and applied.get('enabled') != enabled:
+            action.setEnabled(enabled)
+            applied['enabled'] = enabled
+        if checked is not _UNSET and action.isChecked() != checked:
+            action.setChecked(checked)
+
+    def refresh(self) -> RoundMenu:
+        """按当前状态刷新菜单（必要时先构建）并返回菜单"""
+        window = self._window
+        if self.menu is None or self._lang_code != window.l18n.lang_code:
+            self._build()
+        mode_key = window.current_mode_key()
+        is_clock_mode = mode_key == 'clock'
+        running = window.is_running or is_clock_mode
+
+        self._set(
+            self.pause_action,
+            text=window.tr('pause') if running else window.tr('continue'),
+            icon=FluentIcon.PAUSE if running else FluentIcon.PLAY,
+            enabled=not is_clock_mode,
+        )
+        self._set(self.countup_action, checked=mode_key == 'countup')
+        self._set(self.countdown_action, checked=mode_key == 'countdown')
+        self._set(self.clock_action, checked=is_clock_mode)
+        self._set(self.visibility_action, icon=FluentIcon.HIDE if window.isVisible() else FluentIcon.VIEW)
+        self._set(
+            self.fullscreen_action,
+            text=window.tr('exit_fullscreen') if window.is_fullscreen else window.tr('enter_fullscreen'),
+        )
+        self._set(
+            self.lock_action,
+            text=window.tr('unlock_window') if window.is_locked else window.tr('lock_window'),
+            icon=FluentIcon.UNPIN if window.is_locked else FluentIcon.PIN,
+        )
+        self._sync_presets(window.settings.get('countdown_presets', []))
+        return self.menu
+
+    def popup(self, pos: QPoint) -> None:
+        """刷新后在 pos 处弹出菜单"""
+        menu = self.refresh()
+        if menu is None:
+            return
+        layout = menu.layout()
+        margins = layout.contentsMargins() if layout is not None else QMargins(0, 0, 0, 0)
+        menu.exec(QPoint(pos.x() + margins.left(), pos.y() + 4))
+
+    def _trigger_preset(self, action: QAction) -> None:
+        hours, minutes, seconds = action.data()
+        self._window.quick_countdown(hours, minutes, seconds)
+
+    def _preset_action(self) -> QAction:
+        action = QAction(self.menu)
+        action.triggered.connect(lambda _=False, a=action: self._trigger_preset(a))
+        return action
+
+    def _sync_presets(self, presets: list[dict[str, Any]]) -> None:
+        """让预设子菜单与预设列表一致：只处理新增、删除、移动与文本变化的预设"""
+        # 预设列表每次变化都会换成新的列表对象，同一个列表无需再比较
+        if presets is self._synced_presets:
+            return
+        menu = self._countdown_menu
+        if menu is None:
+            return
+        window = self._window
+        entries: list[tuple[str, dict[str, Any]]] = []
+        seen = set()
+        for preset in presets if isinstance(presets, list) else []:
+            preset_id = preset.get('id') if isinstance(preset, dict) else None
+            if isinstance(preset_id, str) and preset_id not in seen:
+                seen.add(preset_id)
+                entries.append((preset_id, preset))
+
+        actions = self._preset_actions
+        for preset_id in self._preset_order:
+            if preset_id not in seen:
+                action = actions.pop(preset_id)
+                menu.removeAction(action)
+                self._applied.pop(action, None)
+                action.deleteLater()
+
+        # 保留最长的相对顺序不变的一组动作，只移动其余动作；从后向前插入，锚点总在最终位置
+        old_index = {preset_id: i for i, preset_id in enumerate(self._preset_order) if preset_id in seen}
+        keep = increasing_subset([old_index.get(preset_id) for preset_id, _preset in entries])
+        anchor: QAction | None = None
+        for position in range(len(entries) - 1, -1, -1):
+            preset_id, preset = entries[position]
+            action = actions.get(preset_id)
+            if position not in keep:
+                if action is None:
+                    action = actions[preset_id] = self._preset_action()
+                else:
+                    menu.removeAction(action)
+                if anchor is None:
+                    menu.addAction(action)
+                else:
+                    menu.insertAction(anchor, action)
+            anchor = action
+
+        for preset_id, preset in entries:
+            action = actions[preset_id]
+            label, duration = window._preset_display_text(preset)
+            self._set(action, text=label)
+            applied = self._applied[action]
+            if applied.get('duration') != duration:
+                action.setToolTip(duration)
+                # 预设集合中的时分秒已校验
+                action.setData((preset.get('hours', 0), preset.get('minutes', 0), preset.get('seconds', 0)))
+                applied['duration'] = duration
+
+        if entries and self._placeholder is not None:
+            menu.removeAction(self._placeholder)
+            self._placeholder.deleteLater()
+            self._placeholder = None
+        elif not entries and self._placeholder is None:
+            self._placeholder = QAction(window.tr('no_presets_available'), self.menu)
+            self._placeholder.setEnabled(False)
+            menu.addAction(self._placeholder)
+
+        self._preset_order = [preset_id for preset_id, _preset in entries]
+        self._synced_presets = presets
+        logger.debug("preset menu synced: %d presets", len(entries))
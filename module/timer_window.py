@@ -1,14 +1,10 @@
-import json
 import logging
 import os
-import random
+import re
 import threading
-import types
-import uuid
 
-from PyQt6.QtCore import QMargins, QPoint, Qt, QTimer, QUrl
-from PyQt6.QtGui import QAction, QCursor, QFont, QIcon, QKeySequence, QIntValidator, QShortcut
-from PyQt6.QtMultimedia import QAudioOutput, QMediaPlayer
+from PyQt6.QtCore import QDate, QDateTime, QPoint, QSize, Qt, QTime, QTimer
+from PyQt6.QtGui import QAction, QCursor, QFont, QFontMetrics, QIcon, QKeySequence, QIntValidator, QShortcut
 from PyQt6.QtWidgets import (
     QApplication,
     QLabel,
@@ -22,16 +18,7 @@ from PyQt6.QtWidgets import (
     QSystemTrayIcon,
     QVBoxLayout,
 )
-from qfluentwidgets import (
-    CheckableMenu,
-    CheckableSystemTrayMenu,
-    FluentIcon,
-    MenuAnimationType,
-    RoundMenu,
-    SystemTrayMenu,
-    Theme,
-    setTheme,
-)
+from qfluentwidgets import FluentIcon, Theme, setTheme
 
 try:
     from win10toast import ToastNotifier
@@ -40,10 +27,25 @@ try:
 except ImportError:
     toaster = None
 
-from .constants import DEFAULT_COUNTDOWN_PRESETS, DEFAULT_SHORTCUTS, TimerConstants
+from .clock_format import clock_settings_key, compile_clock_formatter
+from .alarm_player import AlarmPlayer
+from .constants import DEFAULT_COUNTDOWN_PRESETS, DEFAULT_COUNTDOWN_TIME, DEFAULT_SHORTCUTS, TimerConstants
+from .display_style import adjust_brightness, compile_display_styles, hex_to_rgb
+from .flash import FlashRenderer
 from .localization import L18n
+from .loudness import loudness_gain
 from .paths import get_base_path
+from .preset_collection import PresetCollection, clean_labels, default_presets, normalize_presets
+from .preset_store import PresetStore
 from .settings_dialog import SettingsDialog
+from .settings_migrations import CURRENT_SCHEMA_VERSION, migrate_settings
+from .settings_model import SettingsModel, setting_groups
+from .settings_store import get_settings_repository
+from .sound_cache import PcmCache
+from .sound_library import SoundLibrary
+from .timer_face import TimerFace
+from .timer_menu import TimerMenu
+from .timing import TimerEngine, ms_until_next_boundary
 
 logger = logging.getLogger(__name__)
 
@@ -124,12 +126,19 @@ class TimerWindow(QMainWindow):
         super().__init__()
         # 计算基础路径（一次性，避免重复）
         self.base_path = get_base_path()
+        self._settings_repo = get_settings_repository(self.base_path)
+        self._preset_store = PresetStore(self.get_resource_path("settings", "presets.sqlite3"))
+        self._presets = PresetCollection()
         
         self.l18n = L18n(lang_code=self.get_language())
         self._current_language = self.l18n.lang_code
         self.load_settings()
+        self._clock_formatter_key = None
+        self._refresh_clock_formatter()
         self._last_theme_state = None
-        self._menu_exec_patched: set[int] = set()
+        # 托盘菜单与右键菜单只构建一次，打开前增量刷新
+        self._tray_menu_model = TimerMenu(self, is_tray=True)
+        self._context_menu_model = TimerMenu(self, is_tray=False)
         # 启动时根据设置决定初始模式
         try:
             behavior = self.settings.get('startup_mode_behavior', 'restore')
@@ -147,6 +156,8 @@ class TimerWindow(QMainWindow):
                 self.settings['timer_mode'] = key_to_text.get(fixed_key, self.tr('countdown_mode'))
         except Exception as _e:
             logger.debug("enforce startup mode failed: %s", _e)
+        # 计时值由单调时钟引擎推算，elapsed_seconds / is_running 为其属性视图
+        self._timer_engine = TimerEngine()
         self.elapsed_seconds = 0
         self.is_running = self.settings.get("auto_start_timer", False)
         self.is_flashing = False
@@ -154,14 +165,28 @@ class TimerWindow(QMainWindow):
         self.is_fullscreen = False  # ȫ��״̬
         self._stored_geometry = None
         self._stored_window_flags = None
-        self.last_displayed_text = ""  # 缓存上一次显示的文本，用于优化窗口大小调整
-        self.audio_output = QAudioOutput(self)
-        self.audio_output.setVolume(0.8)
-        self.media_player = QMediaPlayer(self)
-        self.media_player.setAudioOutput(self.audio_output)
+        # 窗口尺寸按 (显示控件, 字体, 字号, 字重, 样式, 显示格式) 缓存；_geometry_state 为当前尺寸对应的 (模式, 文本长度)
+        self._display_size_cache: dict[tuple, QSize] = {}
+        # 当前的常规显示样式（样式表或 FaceStyle），其内边距影响尺寸，参与尺寸缓存的键
+        self._display_style = None
+        self._geometry_state: tuple[str, int] | None = None
+        self._sound_library = SoundLibrary(
+            os.path.join(self.base_path, 'sounds'),
+            self.get_resource_path("settings", "sound_index.json"),
+            self,
+        )
+        self._sound_cache = PcmCache(self.get_resource_path("settings", "sound_cache"), parent=self)
+        self._alarm_player = AlarmPlayer(self._sound_cache, self)
+        self._sound_cache.ready.connect(self._on_sound_cached)
+        self._audio_warmup_scheduled = False
+        # 窗口显示后的预热回调之前只使用已缓存的响度，不在启动路径上分析文件
+        self._audio_ready = False
+        self._sound_library.changed.connect(self._preload_alarm)
+        self._sound_library.loudness_ready.connect(self._on_loudness_ready)
         
         # 延迟保存机制
         self._pending_save = False  # 标记是否有待保存的设置
+        self._compact_on_save = False  # 下一次保存写完整快照而不是追加改动日志
         self._save_timer = QTimer(self)
         self._save_timer.setSingleShot(True)  # 单次触发
         self._save_timer.timeout.connect(self._do_save_settings)
@@ -179,6 +204,27 @@ class TimerWindow(QMainWindow):
         self.apply_settings()
         self.ensure_sounds_folder()
     
+    @property
+    def elapsed_seconds(self) -> int:
+        """当前计时值（秒）；倒计时时表示剩余秒数"""
+        return self._timer_engine.seconds()
+
+    @elapsed_seconds.setter
+    def elapsed_seconds(self, value: int) -> None:
+        self._timer_engine.reset(value, countdown=self.current_mode_key() == 'countdown')
+
+    @property
+    def is_running(self) -> bool:
+        return self._timer_engine.running
+
+    @is_running.setter
+    def is_running(self, value: bool) -> None:
+        if value:
+            self._timer_engine.start()
+        else:
+            self._timer_engine.pause()
+        self._schedule_next_tick()
+
     def get_resource_path(self, *paths):
         """
         获取资源文件路径
@@ -247,14 +293,8 @@ class TimerWindow(QMainWindow):
         return mode_key
         
     def get_language(self):
-        """从设置获取语言代码"""
-        try:
-            settings_path = self.get_resource_path("settings", "timer_settings.json")
-            with open(settings_path, 'r', encoding='utf-8') as f:
-                settings = json.load(f)
-            return settings.get('language', 'zh_CN')
-        except Exception:
-            return 'zh_CN'
+        """从设置获取语言代码（与 load_settings 共享同一次文件解析）"""
+        return self._settings_repo.language()
         
     def tr(self, sourceText: str, disambiguation: str | None = None, n: int = -1) -> str:  # type: ignore[override]
         _ = disambiguation
@@ -267,33 +307,37 @@ class TimerWindow(QMainWindow):
             try:
                 self.l18n.load(desired_lang)
                 self._current_language = desired_lang
+                self._presets.invalidate_texts()
             except Exception as exc:
                 logger.warning("Failed to switch language to %s: %s", desired_lang, exc)
         
     def load_settings(self):
         """加载设置"""
-        settings_dir = self.get_resource_path("settings")
-        self.settings_file = os.path.join(settings_dir, "timer_settings.json")
+        self.settings_file = self._settings_repo.settings_file
         # 调试：打印设置文件路径
         logger.debug("settings file: %s", self.settings_file)
         
         default_settings = {
+            # 设置结构版本，低于 CURRENT_SCHEMA_VERSION 时在加载时执行迁移
+            "schema_version": CURRENT_SCHEMA_VERSION,
             "font_family": "Consolas",
             "font_size": 96,  # 增加字体大小，窗口会更大
             "text_color": "#E0E0E0",
             "bg_color": "#1E1E1E",
             "bg_opacity": 200,
             "night_mode": False,
+            # 使用绘制式表盘（字形位图缓存 + 局部重绘），关闭时使用 QLabel
+            "painted_face": False,
             "timer_mode": "倒计时",  # 默认倒计时模式
             # 语言无关的计时模式键（与 timer_mode 文本解耦）
             "timer_mode_key": "countdown",  # 可选: 'countup' | 'countdown' | 'clock'
             # 倒计时默认时间设置
-            "countdown_hours": 0,
-            "countdown_minutes": 25,
-            "countdown_seconds": 0,
+            **DEFAULT_COUNTDOWN_TIME,
             # 倒计时结束动作
             "countdown_action": "beep",
             "countdown_action_key": "beep",  # 可选: 'beep' | 'flash' | 'beep_flash'
+            # 闪烁节奏（毫秒，偶数步为提醒色、奇数步为常规色）；为空时使用 TimerConstants 默认值
+            "flash_pattern": [],
             # 音效文件设置
             "sound_file": "sounds/Alarm01.wav",  # 默认音效
             "sound_volume": 80,
@@ -319,90 +363,67 @@ class TimerWindow(QMainWindow):
             "preset_sort_mode": "manual",
         }
         
-        if os.path.exists(self.settings_file):
+        # 兼容迁移与修正只在内存中进行，最后至多写回一次
+        needs_save = False
+        loaded = self._settings_repo.load()
+        if loaded is not None:
             try:
-                with open(self.settings_file, 'r', encoding='utf-8') as f:
-                    self.settings = json.load(f)
+                self.settings = SettingsModel(loaded)
                 logger.debug(
                     "loaded timer_mode_key=%s timer_mode=%s",
                     self.settings.get('timer_mode_key'),
                     self.settings.get('timer_mode'),
                 )
+                # 旧版本配置按 schema_version 执行迁移链；须在补全默认值之前，否则缺失的键会被默认值掩盖
+                needs_save = migrate_settings(self.settings, self)
                 # 确保所有键都存在
                 for key, value in default_settings.items():
                     if key not in self.settings:
                         self.settings[key] = value
-                # 确保快捷键子项存在并合并默认
-                if 'shortcuts' not in self.settings or not isinstance(self.settings['shortcuts'], dict):
-                    self.settings['shortcuts'] = dict(DEFAULT_SHORTCUTS)
-                else:
-                    merged = dict(DEFAULT_SHORTCUTS)
-                    merged.update(self.settings['shortcuts'])
-                    self.settings['shortcuts'] = merged
-
-                # 兼容旧版本：若没有 language-independent 模式键，则根据旧的文本推断
-                if 'timer_mode_key' not in self.settings:
-                    self.settings['timer_mode_key'] = self.derive_mode_key(self.settings.get('timer_mode', ''))
-                    # 立即保存，确保后续启动稳定
-                    try:
-                        self.save_settings(immediate=True)
-                    except Exception:
-                        pass
-                # 兼容旧版本：倒计时动作键
-                action_key = self.settings.get("countdown_action_key")
-                if action_key not in ('beep', 'flash', 'beep_flash'):
-                    self.settings["countdown_action_key"] = self.derive_action_key(
-                        self.settings.get("countdown_action", "")
-                    )
-                    try:
-                        self.save_settings(immediate=True)
-                    except Exception:
-                        pass
-                
-                # 兼容旧版本：将绝对路径转换为相对路径
-                if "sound_file" in self.settings and self.settings["sound_file"]:
-                    sound_file = self.settings["sound_file"]
-                    # 如果是绝对路径，尝试转换为相对路径
-                    if os.path.isabs(sound_file):
-                        try:
-                            rel_path = os.path.relpath(sound_file, self.base_path)
-                            # 如果文件在 sounds 文件夹内，转换为相对路径
-                            if rel_path.startswith('sounds') and os.path.exists(sound_file):
-                                self.settings["sound_file"] = rel_path
-                                # 立即保存转换后的设置
-                                self.save_settings(immediate=True)
-                                logger.info("Converted absolute sound path to relative: %s", rel_path)
-                        except (ValueError, OSError):
-                            # 转换失败，保持原样
-                            pass
             except Exception:
                 logger.exception("failed to load settings, fallback to defaults")
-                self.settings = default_settings
+                self.settings = SettingsModel(default_settings)
         else:
-            self.settings = default_settings
-        # 再次确保 shortcuts 完整
-        try:
-            merged = dict(DEFAULT_SHORTCUTS)
-            merged.update(self.settings.get('shortcuts', {}))
-            self.settings['shortcuts'] = merged
-        except Exception:
-            self.settings['shortcuts'] = dict(DEFAULT_SHORTCUTS)
+            self.settings = SettingsModel(default_settings)
+        # 确保快捷键子项完整并合并默认
+        shortcuts = self.settings.get('shortcuts')
+        merged = dict(DEFAULT_SHORTCUTS)
+        if isinstance(shortcuts, dict):
+            merged.update(shortcuts)
+        self.settings['shortcuts'] = merged
 
-        presets_normalized, presets_changed = self._normalize_countdown_presets(
-            self.settings.get('countdown_presets')
-        )
-        self.settings['countdown_presets'] = presets_normalized
-        if presets_changed:
-            try:
-                self.save_settings(immediate=True)
-            except Exception:
-                pass
+        # 倒计时预设保存在独立的预设库中；预设库为空时导入配置文件中的预设（或默认预设）
+        if self._preset_store.available:
+            presets = self._preset_store.load_all()
+            if presets:
+                # 预设库中的预设写入前已校验，直接采用
+                self._presets.adopt(presets)
+            else:
+                self._presets.reset(self.settings.get('countdown_presets'), self.settings.get('language', 'zh_CN'))
+                self._preset_store.sync(self._presets.entries(), self._presets.revisions())
+            self._presets.take_dirty()
+            self.settings['countdown_presets'] = self._presets.entries()
+            if loaded is not None and 'countdown_presets' in loaded:
+                # 配置文件中仍有预设副本，写回一次将其移除
+                needs_save = True
+        elif self.ensure_presets_normalized():
+            needs_save = True
         
         # 验证并修正设置
-        self._validate_and_fix_settings()
+        if self._validate_and_fix_settings():
+            needs_save = True
+        if needs_save:
+            # 此时延迟保存定时器尚未创建，直接写入完整快照
+            self._pending_save = True
+            self._compact_on_save = True
+            self._do_save_settings()
+        # 补全的默认值与磁盘内容的差异不需要单独记入改动日志
+        self.settings.take_unsaved()
+        # 加载期间的补全与迁移不算作待应用的改动
+        self.settings.mark_clean()
             
-    def _validate_and_fix_settings(self):
-        """验证设置值的有效性,并修正无效的设置"""
+    def _validate_and_fix_settings(self) -> bool:
+        """验证设置值的有效性,并修正无效的设置；返回是否有修正（由调用方统一保存）"""
         fixed = False
         
         # 验证字体大小
@@ -472,6 +493,19 @@ class TimerWindow(QMainWindow):
             )
             fixed = True
 
+        if not isinstance(self.settings.get("painted_face", False), bool):
+            self.settings["painted_face"] = False
+            fixed = True
+
+        # 验证闪烁节奏
+        flash_pattern = self.settings.get("flash_pattern", [])
+        if not isinstance(flash_pattern, list) or len(flash_pattern) > TimerConstants.FLASH_PATTERN_MAX_STEPS or not all(
+            isinstance(ms, int) and not isinstance(ms, bool) and 0 < ms <= TimerConstants.FLASH_STEP_MAX_MS
+            for ms in flash_pattern
+        ):
+            self.settings["flash_pattern"] = []
+            fixed = True
+
         # 验证音量
         volume = self.settings.get("sound_volume", 80)
         if not isinstance(volume, int) or not 0 <= volume <= 100:
@@ -489,87 +523,37 @@ class TimerWindow(QMainWindow):
             self.settings["startup_mode_behavior"] = 'restore'
             fixed = True
 
-        # 如果修正了任何设置,立即保存
         if fixed:
             logger.info("Detected invalid settings values, auto corrected.")
-            self.save_settings(immediate=True)
+        return fixed
 
     def _default_countdown_presets(self):
-        return [dict(preset) for preset in DEFAULT_COUNTDOWN_PRESETS]
+        return default_presets()
 
     def _normalize_countdown_presets(self, presets):
         """确保倒计时预设结构合法"""
-        source = presets if isinstance(presets, list) else []
-        normalized = []
-        changed = False
-
-        if not source:
-            source = self._default_countdown_presets()
-            changed = True
-
-        seen_ids = set()
-        current_lang = self.settings.get('language', 'zh_CN')
-        for entry in source:
-            if not isinstance(entry, dict):
-                changed = True
-                continue
-
-            preset_id = entry.get('id')
-            if not isinstance(preset_id, str) or not preset_id.strip():
-                preset_id = f"preset_{uuid.uuid4().hex[:8]}"
-                changed = True
-            if preset_id in seen_ids:
-                preset_id = f"{preset_id}_{uuid.uuid4().hex[:4]}"
-                changed = True
-            seen_ids.add(preset_id)
-
-            hours = _clamp_int(entry.get('hours', 0), 0, 99)
-            minutes = _clamp_int(entry.get('minutes', 0), 0, 59)
-            seconds = _clamp_int(entry.get('seconds', 0), 0, 59)
-
-            labels = self._clean_labels(entry.get('labels'))
-
-            name_key = entry.get('name_key')
-            if isinstance(name_key, str):
-                name_key = name_key.strip()
-            else:
-                name_key = None
-
-            single_label = entry.get('label')
-            if isinstance(single_label, str) and single_label.strip():
-                stripped = single_label.strip()
-                labels.setdefault(current_lang, stripped)
-
-            label_value = labels.get(current_lang)
-            if not label_value and labels:
-                # fallback to any existing label
-                label_value = next(iter(labels.values()))
-
-            normalized.append({
-                'id': preset_id,
-                'mode': 'countdown',
-                'hours': hours,
-                'minutes': minutes,
-                'seconds': seconds,
-                **({'label': label_value} if label_value else {}),
-                **({'labels': labels} if labels else {}),
-                **({'name_key': name_key} if name_key else {}),
-            })
-
-        if not normalized:
-            normalized = self._default_countdown_presets()
-            changed = True
-
-        return normalized, changed
+        return normalize_presets(presets, self.settings.get('language', 'zh_CN'))
 
     def ensure_presets_normalized(self):
-        normalized, changed = self._normalize_countdown_presets(
-            self.settings.get('countdown_presets')
-        )
-        if changed:
-            self.settings['countdown_presets'] = normalized
+        """预设列表被整体替换（不是已校验的集合）时整体重新校验；返回是否修正了内容"""
+        presets = self.settings.get('countdown_presets')
+        if presets is self._presets.entries():
+            return False
+        changed = self._presets.reset(presets, self.settings.get('language', 'zh_CN'))
+        self.settings['countdown_presets'] = self._presets.entries()
         return changed
 
+    def update_presets(self, presets, touched_ids) -> bool:
+        """
+        提交预设编辑（设置对话框）
+
+        只重新校验新增或在 touched_ids 中的条目，其余条目沿用已校验的版本。返回预设是否有变化。
+        """
+        if not self._presets.update(presets, touched_ids, self.settings.get('language', 'zh_CN')):
+            return False
+        self.settings['countdown_presets'] = self._presets.entries()
+        return True
+
     def _format_preset_duration(self, preset):
         hours = _clamp_int(preset.get('hours', 0), 0, 99)
         minutes = _clamp_int(preset.get('minutes', 0), 0, 59)
@@ -620,16 +604,7 @@ class TimerWindow(QMainWindow):
 
     @staticmethod
     def _clean_labels(raw_labels):
-        labels = {}
-        if isinstance(raw_labels, dict):
-            for lang_code, text in raw_labels.items():
-                if not isinstance(lang_code, str):
-                    continue
-                if isinstance(text, str):
-                    stripped = text.strip()
-                    if stripped:
-                        labels[lang_code] = stripped
-        return labels
+        return clean_labels(raw_labels)
 
     def _resolve_preset_label(self, preset):
         lang_code = self.settings.get('language', 'zh_CN')
@@ -643,6 +618,14 @@ class TimerWindow(QMainWindow):
                 return translated
         return self._format_duration_text(preset)
 
+    def _preset_display_text(self, preset):
+        """菜单中预设的 (显示名称, 时长)，按预设 id、修订号与语言缓存"""
+        return self._presets.display_text(
+            preset,
+            self.settings.get('language', 'zh_CN'),
+            lambda p: (self._resolve_preset_label(p), self._format_preset_duration(p)),
+        )
+
     def prompt_custom_countdown(self):
         """一次性自定义倒计时"""
         dialog = CustomCountdownDialog(self, self.tr)
@@ -661,13 +644,16 @@ class TimerWindow(QMainWindow):
             return
         self.quick_countdown(hours, minutes, seconds)
     
-    def save_settings(self, immediate=False):
+    def save_settings(self, immediate=False, compact=False):
         """
         延迟保存设置（防抖动）
         
         Args:
             immediate: 是否立即保存，跳过延迟机制
+            compact: 是否写完整快照并清空改动日志（退出时使用）
         """
+        if compact:
+            self._compact_on_save = True
         if immediate:
             # 立即保存
             self._pending_save = True
@@ -684,83 +670,126 @@ class TimerWindow(QMainWindow):
         if not self._pending_save:
             return
 
-        self.ensure_presets_normalized()
+        changed = self.settings.take_unsaved()
+        if 'countdown_presets' in changed:
+            self.ensure_presets_normalized()
+            changed |= self.settings.take_unsaved()
+            if self._preset_store.available:
+                # 预设单独写入预设库，只提交变化的行
+                changed.discard('countdown_presets')
+                if self._presets.take_dirty():
+                    self._preset_store.sync(self._presets.entries(), self._presets.revisions())
 
         try:
-            # 确保 settings 目录存在
-            settings_dir = os.path.dirname(self.settings_file)
-            if not os.path.exists(settings_dir):
-                os.makedirs(settings_dir)
-
-            with open(self.settings_file, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, indent=4, ensure_ascii=False)
-
+            repo = self._settings_repo
+            if self._compact_on_save or repo.needs_compaction():
+                # 压缩：完整快照原子写入并清空改动日志（内容未变且无日志时跳过）
+                if repo.save(self._settings_document()):
+                    logger.debug("Settings saved.")
+                self._compact_on_save = False
+            elif changed:
+                # 常规保存只追加改动的键，磁盘开销与改动大小成正比
+                delta = {key: self.settings[key] for key in changed if key in self.settings}
+                removed = [key for key in changed if key not in self.settings]
+                if not repo.append(delta, removed):
+                    repo.save(self._settings_document())
             self._pending_save = False
-            logger.debug("Settings saved.")
         except Exception as e:
             logger.error("Failed to save settings: %s", e)
     
+    def _settings_document(self) -> dict:
+        """写入 timer_settings.json 的内容：预设库可用时不包含预设"""
+        if not self._preset_store.available:
+            return self.settings
+        return {key: value for key, value in self.settings.items() if key != 'countdown_presets'}
+
     def ensure_sounds_folder(self):
         """确保sounds文件夹存在，并随机选择铃声"""
-        # 获取 exe 所在目录（打包后）或脚本所在目录（开发时）
-        base_path = self.base_path
-        
-        sounds_dir = os.path.join(base_path, 'sounds')
-        if not os.path.exists(sounds_dir):
-            os.makedirs(sounds_dir)
+        library = self._sound_library
+        library.ensure_folder()
         
         # 如果用户没有指定铃声文件，或文件不存在，随机选择一个
         current_sound = self.settings.get("sound_file", "")
-        # 如果是相对路径，转换为绝对路径检查
-        if current_sound and not os.path.isabs(current_sound):
-            current_sound = os.path.join(base_path, current_sound)
-        
-        if not self.settings.get("sound_file", "") or not os.path.exists(current_sound):
-            sound_files = self.get_sound_files()
-            if sound_files:
+        if not current_sound or not library.exists(self.resolve_sound_path(current_sound)):
+            selected_sound = library.random_choice()
+            if selected_sound:
                 # 随机选择一个铃声文件，保存为相对路径
-                selected_sound = random.choice(sound_files)
-                rel_path = os.path.relpath(selected_sound, base_path)
+                rel_path = os.path.relpath(selected_sound, self.base_path)
                 self.settings["sound_file"] = rel_path
                 self.save_settings()
+                self._preload_alarm()
                 logger.debug("Random sound selected: %s", os.path.basename(selected_sound))
+
+    @property
+    def sound_library(self) -> SoundLibrary:
+        return self._sound_library
+
+    def resolve_sound_path(self, sound_file: str) -> str:
+        """相对路径（相对于程序目录）转换为绝对路径"""
+        if sound_file and not os.path.isabs(sound_file):
+            return os.path.join(self.base_path, sound_file)
+        return sound_file
     
     def get_sound_files(self):
         """获取sounds文件夹中的所有音频文件"""
-        # 获取 exe 所在目录（打包后）或脚本所在目录（开发时）
-        base_path = self.base_path
-        
-        sounds_dir = os.path.join(base_path, 'sounds')
-        if not os.path.exists(sounds_dir):
-            return []
-        
-        # 支持的音频格式
-        audio_extensions = ['.wav', '.mp3', '.ogg', '.m4a', '.flac']
-        sound_files = []
-        
-        try:
-            for file in os.listdir(sounds_dir):
-                file_path = os.path.join(sounds_dir, file)
-                if os.path.isfile(file_path):
-                    ext = os.path.splitext(file)[1].lower()
-                    if ext in audio_extensions:
-                        sound_files.append(file_path)
-        except Exception as e:
-            logger.error("Failed to read sounds folder: %s", e)
-        
-        return sound_files
+        return self._sound_library.files()
             
+    @property
+    def alarm_player(self) -> AlarmPlayer:
+        return self._alarm_player
+
+    def _preload_alarm(self) -> None:
+        """提前载入当前铃声（设置应用时与 sounds 文件夹变化后）"""
+        sound_file = self.resolve_sound_path(self.settings.get("sound_file", ""))
+        library = self._sound_library
+        if not sound_file or not library.exists(sound_file):
+            self._alarm_player.preload(None)
+            return
+        # 文件被替换（修改时间变化）时重新载入
+        info = library.info(sound_file, self._audio_ready) if library.in_folder(sound_file) else None
+        self._alarm_player.preload(sound_file, info.mtime if info is not None else None, self._sound_gain(sound_file))
+
+    def _sound_gain(self, sound_file: str) -> float:
+        """
+        按已分析（并随铃声索引缓存）的响度计算增益
+
+        尚未分析时返回 1.0，分析在线程池中进行，完成后由 _on_loudness_ready 补上；
+        压缩格式在 PCM 缓存就绪后才开始分析。
+        """
+        pcm_path = sound_file
+        if PcmCache.needs_decode(sound_file):
+            pcm_path = self._sound_cache.lookup(sound_file)
+            if pcm_path is None:
+                return 1.0
+        levels = self._sound_library.loudness(sound_file, pcm_path, self._audio_ready)
+        return loudness_gain(levels[0]) if levels is not None else 1.0
+
+    def _warm_up_audio(self) -> None:
+        """窗口显示后的空闲回调：开始分析当前铃声的响度并预热音频后端"""
+        self._audio_ready = True
+        source = self._alarm_player.source
+        if source:
+            self._alarm_player.set_gain(self._sound_gain(source))
+        self._alarm_player.warm_up()
+
+    def _on_loudness_ready(self, path: str) -> None:
+        """后台响度分析完成后应用到当前铃声"""
+        if path == self._alarm_player.source:
+            self._alarm_player.set_gain(self._sound_gain(path))
+
+    def _on_sound_cached(self, source: str, _cached: str) -> None:
+        """压缩铃声解码完成后开始分析缓存的 WAV"""
+        if source == self._alarm_player.source:
+            self._alarm_player.set_gain(self._sound_gain(source))
+
     def play_sound(self, sound_file):
         """播放铃声（停止旧音效后播放新音效）"""
         try:
-            # 停止当前播放的音效
-            if self.media_player.playbackState() == QMediaPlayer.PlaybackState.PlayingState:
-                self.media_player.stop()
-
-            if os.path.exists(sound_file):
-                url = QUrl.fromLocalFile(sound_file)
-                self.media_player.setSource(url)
-                self.media_player.play()
+            if sound_file == self._alarm_player.source:
+                # 已预加载，增益已算好（或仍在后台分析）
+                self._alarm_player.play()
+            elif self._sound_library.exists(sound_file):
+                self._alarm_player.play(sound_file, self._sound_gain(sound_file))
             else:
                 logger.warning("Sound file not found: %s", sound_file)
                 QApplication.beep()
@@ -783,6 +812,7 @@ class TimerWindow(QMainWindow):
         # 创建时间显示标签
         self.time_label = QLabel('00:00:00', self)
         self.time_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self._applied_label_style: str | None = None
         
         # 设置窗口大小和位置
         self.time_label.adjustSize()
@@ -792,16 +822,16 @@ class TimerWindow(QMainWindow):
         self.center_on_screen()
         
         self.setCentralWidget(self.time_label)
+        # 当前显示控件：默认 QLabel，开启 painted_face 时切换为绘制式表盘
+        self.time_face = None
+        self.time_display = self.time_label
         
         # 使窗口可拖动
         self.dragging = False
         self.offset = QPoint()
     
     def center_on_screen(self):
-        """将窗口居中显示在屏幕上"""
-        # 确保窗口已经有正确的尺寸
-        self.adjustSize()
-        
+        """将窗口居中显示在屏幕上（窗口尺寸由 _apply_display_geometry 预先确定）"""
         # 获取屏幕几何信息
         screen = QApplication.primaryScreen()
         if screen is None:
@@ -828,24 +858,97 @@ class TimerWindow(QMainWindow):
         if theme_state != getattr(self, "_last_theme_state", None):
             self._last_theme_state = theme_state
             setTheme(theme, save=False, lazy=lazy)
-            if getattr(self, "tray_icon", None) is not None:
-                self.create_tray_menu()
+            # 菜单图标随主题变化，下次打开时重新构建
+            self._invalidate_menus()
         
     def apply_settings(self, preserve_elapsed=False, preserve_position=False):
-        """应用设置"""
+        """应用全部设置（启动、全屏切换等窗口状态整体变化时使用）"""
+        self.settings.mark_clean()
         self._ensure_language()
         current_pos = self.pos() if preserve_position and not self.is_fullscreen else None
 
+        self._apply_appearance_settings()
+        self._apply_audio_settings()
+        self._apply_mode_settings(preserve_elapsed)
+        self._refresh_display(current_pos)
+
+        # 更新托盘图标
+        self.update_tray_icon()
+        self.setWindowTitle(self.tr('app_name'))
+
+    def apply_settings_changes(self) -> set[str]:
+        """
+        只重新应用有改动的设置分组
+
+        改动由 SettingsModel 记录；例如只调整音量或铃声时仅更新铃声播放器，
+        只修改快捷键时仅重新绑定 QShortcut。返回实际应用的分组。
+        """
+        groups = setting_groups(self.settings.take_changes())
+        # 语言预览会让界面语言与设置暂时不一致，此时同样需要应用语言分组
+        if self.settings.get('language', 'zh_CN') != getattr(self.l18n, 'lang_code', None):
+            groups.add("language")
+        if not groups:
+            return groups
+        logger.debug("apply_settings_changes groups=%s", sorted(groups))
+        current_pos = self.pos() if not self.is_fullscreen else None
+
+        if "language" in groups:
+            self._ensure_language()
+            self.setWindowTitle(self.tr('app_name'))
+        if "appearance" in groups:
+            self._apply_appearance_settings()
+        if "audio" in groups:
+            self._apply_audio_settings()
+        if "mode" in groups:
+            self._apply_mode_settings(preserve_elapsed=False)
+        if groups & {"appearance", "mode"}:
+            self._refresh_display(current_pos)
+        if "mode" in groups:
+            self.update_tray_icon()
+        if "shortcuts" in groups:
+            self.reload_shortcuts()
+        if groups & {"language", "mode", "presets"} and getattr(self, "tray_icon", None) is not None:
+            self.create_tray_menu()
+        # 应用过程中写回的规范化值（如合并默认快捷键）不再算作改动
+        self.settings.mark_clean()
+        return groups
+
+    def _apply_appearance_settings(self) -> None:
+        """主题、显示控件、字体、颜色样式与时钟格式"""
         theme_mode = self.settings.get("theme_mode", "auto")
         self._apply_fluent_theme(theme_mode, lazy=True)
+        self._ensure_display_widget()
         # 应用字体
         font = QFont(
             self.settings.get("font_family", "Consolas"),
             self.settings.get("font_size", 96),
             QFont.Weight.Bold,
         )
-        self.time_label.setFont(font)
+        self.time_display.setFont(font)
+
+        # 应用颜色和透明度：常规/闪烁提醒两套样式按外观参数缓存，闪烁时只需切换
+        corner_radius = self.settings.get("corner_radius", 15) if self.settings.get("rounded_corners", True) else 0
+        painted = self.time_display is self.time_face
+        styles = compile_display_styles(
+            self.settings["text_color"],
+            self.settings["bg_color"],
+            self.settings["bg_opacity"],
+            bool(self.settings["night_mode"]),
+            corner_radius,
+            self.is_fullscreen,
+            painted,
+        )
+        self._display_style = styles.normal
+        self._flash_renderer.set_styles(
+            styles.normal,
+            styles.alert,
+            self.time_face.set_face_style if painted else self._apply_label_style,
+        )
+
+        self._refresh_clock_formatter()
 
+    def _apply_audio_settings(self) -> None:
+        """提醒音量与预加载的铃声"""
         volume = self.settings.get("sound_volume", 80)
         if not isinstance(volume, int):
             try:
@@ -853,76 +956,114 @@ class TimerWindow(QMainWindow):
             except (TypeError, ValueError):
                 volume = 80
         volume = max(0, min(100, volume))
-        self.audio_output.setVolume(volume / 100)
-        
-        # 应用颜色和透明度
-        text_color = self.settings["text_color"]
-        bg_color = self.settings["bg_color"]
-        bg_opacity = self.settings["bg_opacity"]
-        
-        # 夜读模式调整
-        if self.settings["night_mode"]:
-            # 降低亮度
-            text_color = self.adjust_brightness(text_color, 0.6)
-            bg_opacity = min(bg_opacity, 150)
-        
-        if self.is_fullscreen:
-            bg_opacity = 255
-        
-        # 转换RGB
-        bg_rgb = self.hex_to_rgb(bg_color)
-        
-        # 圆角半径
-        corner_radius = self.settings.get("corner_radius", 15) if (self.settings.get("rounded_corners", True) and not self.is_fullscreen) else 0
-        padding = "0px" if self.is_fullscreen else "30px 60px"
-        
-        self.time_label.setStyleSheet(f"""
-            QLabel {{
-                color: {text_color};
-                background-color: rgba({bg_rgb[0]}, {bg_rgb[1]}, {bg_rgb[2]}, {bg_opacity});
-                border-radius: {corner_radius}px;
-                padding: {padding};  /* �����ڱ߾࣬�ô��ڸ����� */
-            }}
-        """)
-        
-        # 重置计时器根据模式键（语言无关）
+        self._alarm_player.set_volume(volume / 100)
+        self._preload_alarm()
+
+    def _apply_mode_settings(self, preserve_elapsed: bool) -> None:
+        """按模式键（语言无关）重置计时值"""
         mode_key = self.current_mode_key()
-        logger.debug("apply_settings with mode_key=%s", mode_key)
+        logger.debug("apply mode settings with mode_key=%s", mode_key)
         if not preserve_elapsed:
-            if mode_key == 'countdown':
-                total_seconds = (self.settings.get("countdown_hours", 0) * 3600 + 
-                                   self.settings.get("countdown_minutes", 25) * 60 + 
-                                   self.settings.get("countdown_seconds", 0))
-                self.elapsed_seconds = total_seconds
-            else:
-                # countup �� clock ���� 0 ��ʼ��ʾ��clock ģʽ��ʹ�� elapsed_seconds��
-                self.elapsed_seconds = 0
-            
+            # countup 与 clock 均从 0 开始显示（clock 模式不使用 elapsed_seconds）
+            self.elapsed_seconds = self._initial_elapsed_seconds()
+
+    def _refresh_display(self, current_pos: QPoint | None) -> None:
+        """刷新显示文本，重新确定窗口尺寸并恢复位置或居中"""
+        # 字体、样式或格式可能已变化，由 update_time 重新确定窗口尺寸
+        self._geometry_state = None
         self.update_time()
-        
-        # 重新计算窗口大小并居中
+
         if not self.is_fullscreen:
-            self.time_label.adjustSize()
-            self.resize(self.time_label.size())
             if current_pos is not None:
                 self.move(current_pos)
             else:
                 self.center_on_screen()
 
-        # 更新托盘图标
-        self.update_tray_icon()
-        self.setWindowTitle(self.tr('app_name'))
-        
+    def _ensure_display_widget(self) -> None:
+        """按 painted_face 设置在 QLabel 与绘制式表盘之间切换中央控件"""
+        want_face = bool(self.settings.get("painted_face", False))
+        if want_face == (self.time_display is self.time_face):
+            return
+        if want_face and self.time_face is None:
+            self.time_face = TimerFace(self.time_label.text(), self)
+        target = self.time_face if want_face else self.time_label
+        previous = self.takeCentralWidget()
+        if previous is not None:
+            # takeCentralWidget 会解除父子关系，重新挂回主窗口以保持所有权
+            previous.setParent(self)
+            previous.hide()
+        target.setText(self.time_display.text())
+        self.setCentralWidget(target)
+        target.show()
+        self.time_display = target
+        self._geometry_state = None
+
+    def _apply_label_style(self, stylesheet: str) -> None:
+        """样式表未变化时跳过 setStyleSheet，避免 Qt 重新解析并重新 polish"""
+        if stylesheet == self._applied_label_style:
+            return
+        self._applied_label_style = stylesheet
+        self.time_label.setStyleSheet(stylesheet)
+
+    def _display_templates(self, mode_key: str) -> tuple[str, ...]:
+        """当前显示格式下最宽的文本：所有数字替换为字体中最宽的数字"""
+        metrics = QFontMetrics(self.time_display.font())
+        widest_digit = max("0123456789", key=metrics.horizontalAdvance)
+        if mode_key == 'clock':
+            # 上午/下午标识宽度可能不同，两者都参与比较
+            day = QDate(2000, 1, 1)
+            texts = {self._clock_formatter(QDateTime(day, QTime(hour, 0))) for hour in (0, 12)}
+        else:
+            texts = {self.time_display.text()}
+        return tuple(sorted(re.sub(r'\d', widest_digit, text) for text in texts))
+
+    def _apply_display_geometry(self, mode_key: str) -> None:
+        """
+        按最宽渲染确定并应用固定窗口尺寸
+
+        尺寸按 (显示控件, 字体, 字号, 字重, 样式, 显示格式) 缓存，只在设置、模式或文本长度变化时重新计算，
+        每秒的文本更新不再调整窗口大小。
+        """
+        display = self.time_display
+        font = display.font()
+        templates = self._display_templates(mode_key)
+        key = (
+            type(display).__name__, font.family(), font.pointSize(), font.weight(), font.italic(),
+            self._display_style, templates,
+        )
+        size = self._display_size_cache.get(key)
+        if size is None:
+            current_text = display.text()
+            size = QSize()
+            for text in templates:
+                display.setText(text)
+                size = size.expandedTo(display.sizeHint())
+            display.setText(current_text)
+            self._display_size_cache[key] = size
+        self._geometry_state = (mode_key, len(display.text()))
+        self.resize(size)
+
+    def _initial_elapsed_seconds(self) -> int:
+        """当前模式的初始计时值：倒计时为设定时长，其余为 0"""
+        if self.current_mode_key() == 'countdown':
+            duration = {key: self.settings.get(key, default) for key, default in DEFAULT_COUNTDOWN_TIME.items()}
+            return duration["countdown_hours"] * 3600 + duration["countdown_minutes"] * 60 + duration["countdown_seconds"]
+        return 0
+
+    def _refresh_clock_formatter(self) -> None:
+        """时钟相关设置变化时重新编译时钟格式化器"""
+        key = clock_settings_key(self.settings)
+        if key != self._clock_formatter_key:
+            self._clock_formatter = compile_clock_formatter(self.settings)
+            self._clock_formatter_key = key
+
     def hex_to_rgb(self, hex_color):
         """将十六进制颜色转换为RGB"""
-        hex_color = hex_color.lstrip('#')
-        return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+        return hex_to_rgb(hex_color)
         
     def adjust_brightness(self, hex_color, factor):
         """调整颜色亮度"""
-        rgb = self.hex_to_rgb(hex_color)
-        adjusted = tuple(int(c * factor) for c in rgb)
-        return f'#{adjusted[0]:02x}{adjusted[1]:02x}{adjusted[2]:02x}'
+        return adjust_brightness(hex_color, factor)
         
     def init_tray(self):
         """初始化系统托盘"""
@@ -941,176 +1082,71 @@ class TimerWindow(QMainWindow):
         # 双击托盘图标显示/隐藏窗口
         self.tray_icon.activated.connect(self.tray_icon_activated)
 
-    def _new_menu(self, title: str | None = None, *, is_tray: bool = False, checkable: bool = False) -> RoundMenu:
-        if is_tray:
-            menu_cls = CheckableSystemTrayMenu if checkable else SystemTrayMenu
-        else:
-            menu_cls = CheckableMenu if checkable else RoundMenu
-        menu = menu_cls(title or "", self)
-        if hasattr(menu, "timer"):
-            try:
-                menu.timer.setInterval(0)
-            except Exception:
-                pass
-        if id(menu) not in self._menu_exec_patched:
-            def _exec_no_ani(self, pos, ani=True, aniType=MenuAnimationType.DROP_DOWN):
-                return RoundMenu.exec(self, pos, ani=False, aniType=MenuAnimationType.NONE)
-            menu.exec = types.MethodType(_exec_no_ani, menu)
-            self._menu_exec_patched.add(id(menu))
-        return menu
-
-    def _hold_menu(self, menu: RoundMenu, attr_name: str) -> None:
-        setattr(self, attr_name, menu)
-        menu.closedSignal.connect(lambda name=attr_name: self._clear_menu(name))
-
-    def _clear_menu(self, attr_name: str) -> None:
-        if getattr(self, attr_name, None) is not None:
-            setattr(self, attr_name, None)
-
-    def _exec_menu(self, menu: RoundMenu, pos: QPoint) -> None:
-        layout = menu.layout()
-        margins = layout.contentsMargins() if layout is not None else QMargins(0, 0, 0, 0)
-        adjusted = QPoint(pos.x() + margins.left(), pos.y() + 4)
-        menu.exec(adjusted, ani=False, aniType=MenuAnimationType.NONE)
-        
-    def build_quick_presets_menu(self, *, is_tray: bool = False) -> RoundMenu:
-        """������ͼ��/�Ҽ��˵��еĿ��ٹ���˵�"""
-        preset_menu = self._new_menu(self.tr('mode_switch_menu'), is_tray=is_tray, checkable=True)
-        preset_menu.setIcon(FluentIcon.MENU)
-
-        countup_action = QAction(self.tr('count_up_mode'), self)
-        self._apply_action_icon(countup_action, FluentIcon.STOP_WATCH)
-        countup_action.setCheckable(True)
-        countup_action.triggered.connect(self.switch_to_count_up)
-        preset_menu.addAction(countup_action)
-
-        preset_menu.addSeparator()
-
-        countdown_menu = self._new_menu(self.tr('countdown_mode'), is_tray=is_tray)
-        countdown_menu.setIcon(FluentIcon.CALENDAR)
-        countdown_presets = self.settings.get('countdown_presets', [])
-        if countdown_presets:
-            for preset in countdown_presets:
-                duration = self._format_preset_duration(preset)
-                label = self._resolve_preset_label(preset)
-                action = QAction(label, self)
-                action.setToolTip(duration)
-                hours = _clamp_int(preset.get('hours', 0), 0, 99)
-                minutes = _clamp_int(preset.get('minutes', 0), 0, 59)
-                seconds = _clamp_int(preset.get('seconds', 0), 0, 59)
-                action.triggered.connect(lambda _, h=hours, m=minutes, s=seconds:
-                                         self.quick_countdown(h, m, s))
-                countdown_menu.addAction(action)
-        else:
-            placeholder = QAction(self.tr('no_presets_available'), self)
-            placeholder.setEnabled(False)
-            countdown_menu.addAction(placeholder)
-        countdown_menu.addSeparator()
-        custom_action = QAction(self.tr('custom_countdown_once'), self)
-        self._apply_action_icon(custom_action, FluentIcon.EDIT)
-        custom_action.triggered.connect(self.prompt_custom_countdown)
-        countdown_menu.addAction(custom_action)
-        preset_menu.addMenu(countdown_menu)
-
-        preset_menu.addSeparator()
-
-        clock_action = QAction(self.tr('clock_mode'), self)
-        self._apply_action_icon(clock_action, FluentIcon.DATE_TIME)
-        clock_action.setCheckable(True)
-        clock_action.triggered.connect(self.switch_to_clock_mode)
-        preset_menu.addAction(clock_action)
-
-        mode_key = self.settings.get('timer_mode_key') or self.derive_mode_key(
-            self.settings.get('timer_mode', '')
-        )
-        countup_action.setChecked(mode_key == 'countup')
-        clock_action.setChecked(mode_key == 'clock')
-        countdown_action = countdown_menu.menuAction()
-        if countdown_action is not None:
-            countdown_action.setCheckable(True)
-            countdown_action.setChecked(mode_key == 'countdown')
-
-        return preset_menu
-        
-    def create_tray_menu(self):
-        """创建托盘菜单"""
-        tray_menu = self._new_menu(is_tray=True)
-        is_clock_mode = self.current_mode_key() == 'clock'
-        
-        # 开始/暂停动作
-        pause_text = self.tr('pause') if (self.is_running or is_clock_mode) else self.tr('continue')
-        self.pause_action = QAction(pause_text, self)
-        self._apply_action_icon(
-            self.pause_action,
-            FluentIcon.PAUSE if (self.is_running or is_clock_mode) else FluentIcon.PLAY,
-        )
-        self.pause_action.triggered.connect(self.toggle_pause)
-        self.pause_action.setEnabled(not is_clock_mode)
-        tray_menu.addAction(self.pause_action)
-        
-        # 重置动作
-        reset_action = QAction(self.tr('reset'), self)
-        self._apply_action_icon(reset_action, FluentIcon.RETURN)
-        reset_action.triggered.connect(self.reset_timer)
-        tray_menu.addAction(reset_action)
-        
-        tray_menu.addSeparator()
-        tray_menu.addMenu(self.build_quick_presets_menu(is_tray=True))
-        
-        tray_menu.addSeparator()
-        window_menu = self._new_menu(self.tr('window_menu'), is_tray=True)
-        window_menu.setIcon(FluentIcon.VIEW)
-
-        settings_action = QAction(self.tr('settings'), self)
-        self._apply_action_icon(settings_action, FluentIcon.SETTING)
-        settings_action.triggered.connect(self.show_settings)
-        window_menu.addAction(settings_action)
-
-        toggle_action = QAction(self.tr('show_hide'), self)
-        self._apply_action_icon(
-            toggle_action,
-            FluentIcon.HIDE if self.isVisible() else FluentIcon.VIEW,
-        )
-        toggle_action.triggered.connect(self.toggle_visibility)
-        window_menu.addAction(toggle_action)
-
-        fullscreen_text = self.tr('exit_fullscreen') if self.is_fullscreen else self.tr('enter_fullscreen')
-        fullscreen_action = QAction(fullscreen_text, self)
-        self._apply_action_icon(fullscreen_action, FluentIcon.FULL_SCREEN)
-        fullscreen_action.triggered.connect(self.toggle_fullscreen)
-        window_menu.addAction(fullscreen_action)
-
-        lock_text = self.tr('unlock_window') if self.is_locked else self.tr('lock_window')
-        lock_action = QAction(lock_text, self)
-        self._apply_action_icon(
-            lock_action,
-            FluentIcon.UNPIN if self.is_locked else FluentIcon.PIN,
-        )
-        lock_action.triggered.connect(self.toggle_lock)
-        window_menu.addAction(lock_action)
+    def _invalidate_menus(self) -> None:
+        self._tray_menu_model.invalidate()
+        self._context_menu_model.invalidate()
 
-        tray_menu.addMenu(window_menu)
-        
-        tray_menu.addSeparator()
-        
-        # 退出动作
-        quit_action = QAction(self.tr('quit'), self)
-        self._apply_action_icon(quit_action, FluentIcon.POWER_BUTTON)
-        quit_action.triggered.connect(self.quit_app)
-        tray_menu.addAction(quit_action)
-        
-        self._tray_menu = tray_menu
+    def create_tray_menu(self):
+        """刷新托盘菜单（首次调用或语言变化时构建，之后只更新变化的部分）"""
+        self._tray_menu_model.refresh()
         
     def init_timer(self):
         """初始化定时器"""
+        # 单次触发 + 每次刷新后重新布置，时钟模式下对齐到整秒/整分
         self.timer = QTimer()
-        self.timer.timeout.connect(self.update_time)
-        self.timer.start(TimerConstants.TIMER_UPDATE_INTERVAL)  # 每秒更新一次
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self._on_tick)
+        self._schedule_next_tick()
         
-        # 闪烁定时器
-        self.flash_timer = QTimer()
-        self.flash_timer.timeout.connect(self.flash_window)
+        # 闪烁提醒
+        self._flash_renderer = FlashRenderer(self)
+        self._flash_renderer.finished.connect(self._on_flash_finished)
         
+    def _next_tick_interval(self) -> int:
+        """
+        计算到下一次刷新的毫秒数
+
+        Returns:
+            毫秒数；-1 表示当前无需刷新（暂停、或隐藏时没有待结束的倒计时）
+        """
+        visible = self.isVisible()
+        if self.current_mode_key() == 'clock':
+            if not visible:
+                return -1
+            period_ms = 1000 if self.settings.get("clock_show_seconds", True) else 60_000
+            now_ms = QDateTime.currentMSecsSinceEpoch()
+            return ms_until_next_boundary(now_ms, period_ms) + TimerConstants.TICK_SLACK_MS
+        engine = self._timer_engine
+        if not engine.running:
+            return -1
+        if not visible:
+            # 隐藏时不渲染，只在倒计时结束时唤醒一次
+            delay = engine.ms_until_finished()
+        else:
+            delay = engine.ms_until_change()
+        return delay + TimerConstants.TICK_SLACK_MS if delay >= 0 else -1
+
+    def _schedule_next_tick(self) -> None:
+        """重新布置单次刷新定时器"""
+        timer = getattr(self, 'timer', None)
+        if timer is None:
+            return
+        interval = self._next_tick_interval()
+        if interval < 0:
+            timer.stop()
+        else:
+            timer.start(interval)
+
+    def _on_tick(self):
+        """刷新定时器回调：窗口隐藏时不渲染，仅处理倒计时结束"""
+        if self.isVisible() or (
+            self.current_mode_key() == 'countdown' and self.is_running and self._timer_engine.finished()
+        ):
+            self.update_time()
+        else:
+            self._schedule_next_tick()
+
     def init_shortcuts(self):
         """初始化快捷键（根据设置绑定）"""
         self._shortcut_objs = []
@@ -1160,6 +1196,7 @@ class TimerWindow(QMainWindow):
         """更新时间显示"""
         # 使用 language-independent 模式键
         mode_key = self.current_mode_key()
+        finished = False
         
         # 时钟模式
         # 调试首帧输出当前模式
@@ -1167,86 +1204,32 @@ class TimerWindow(QMainWindow):
             logger.debug("update_time: mode_key=%s", mode_key)
             self._dbg_printed = True
         if mode_key == 'clock':
-            from PyQt6.QtCore import QDateTime
-            current_time = QDateTime.currentDateTime()
-            
-            # 根据设置构建时间格式
-            if self.settings.get("clock_show_date", False):
-                # 显示日期
-                if self.settings.get("clock_format_24h", True):
-                    # 24小时制带日期
-                    if self.settings.get("clock_show_seconds", True):
-                        time_str = current_time.toString("yyyy-MM-dd HH:mm:ss")
-                    else:
-                        time_str = current_time.toString("yyyy-MM-dd HH:mm")
-                else:
-                    # 12小时制带日期：指示符应贴近时间，不要出现在日期前
-                    date_part = current_time.toString("yyyy-MM-dd")
-                    time_part = current_time.toString("hh:mm:ss") if self.settings.get("clock_show_seconds", True) else current_time.toString("hh:mm")
-                    if self.settings.get("clock_show_am_pm", True):
-                        ampm_style = self.settings.get("clock_am_pm_style", "zh")
-                        # 使用 hour() 判断，更可靠
-                        hour = current_time.time().hour()
-                        is_pm = hour >= 12
-                        indicator = ('PM' if is_pm else 'AM') if ampm_style == 'en' else ('下午' if is_pm else '上午')
-                        pos = self.settings.get("clock_am_pm_position", "before")
-                        time_with_indicator = f"{indicator} {time_part}" if pos == 'before' else f"{time_part} {indicator}"
-                    else:
-                        time_with_indicator = time_part
-                    time_str = f"{date_part} {time_with_indicator}"
-            else:
-                # 不显示日期
-                if self.settings.get("clock_format_24h", True):
-                    # 24小时制
-                    if self.settings.get("clock_show_seconds", True):
-                        time_str = current_time.toString("HH:mm:ss")
-                    else:
-                        time_str = current_time.toString("HH:mm")
-                else:
-                    # 12小时制
-                    if self.settings.get("clock_show_seconds", True):
-                        base = current_time.toString("hh:mm:ss")
-                    else:
-                        base = current_time.toString("hh:mm")
-                    # 是否显示 AM/PM 指示
-                    if self.settings.get("clock_show_am_pm", True):
-                        ampm_style = self.settings.get("clock_am_pm_style", "zh")
-                        # 使用 hour() 判断，更可靠
-                        hour = current_time.time().hour()
-                        is_pm = hour >= 12
-                        indicator = ('PM' if is_pm else 'AM') if ampm_style == 'en' else ('下午' if is_pm else '上午')
-                        pos = self.settings.get("clock_am_pm_position", "before")
-                        time_str = f"{indicator} {base}" if pos == 'before' else f"{base} {indicator}"
-                    else:
-                        time_str = base
-            
-            self.time_label.setText(time_str)
+            # 格式化器在应用设置时按时钟相关设置编译，每次刷新只需一次调用
+            time_str = self._clock_formatter(QDateTime.currentDateTime())
+            self.time_display.setText(time_str)
             
         # 计时器模式
         else:
-            if self.is_running:
-                if mode_key == 'countdown':
-                    self.elapsed_seconds -= 1
-                    if self.elapsed_seconds <= 0:
-                        self.elapsed_seconds = 0
-                        self.is_running = False
-                        self.on_countdown_finished()
-                else:
-                    self.elapsed_seconds += 1
+            # 显示值由引擎按单调时钟推算，不依赖 tick 次数
+            finished = self.is_running and self._timer_engine.finished()
+            if finished:
+                self.is_running = False
+            elapsed = self.elapsed_seconds
                 
-            hours = abs(self.elapsed_seconds) // 3600
-            minutes = (abs(self.elapsed_seconds) % 3600) // 60
-            seconds = abs(self.elapsed_seconds) % 60
+            hours = elapsed // 3600
+            minutes = (elapsed % 3600) // 60
+            seconds = elapsed % 60
             
             time_str = f'{hours:02d}:{minutes:02d}:{seconds:02d}'
-            self.time_label.setText(time_str)
+            self.time_display.setText(time_str)
         
-        # 只在文本内容改变时才调整窗口大小
-        current_text = self.time_label.text()
-        if current_text != self.last_displayed_text and not self.is_fullscreen:
-            self.last_displayed_text = current_text
-            self.time_label.adjustSize()
-            self.resize(self.time_label.size())
+        # 窗口尺寸按最宽渲染预先确定，只有模式或文本长度变化（如正计时超过 99 小时）时才重新计算
+        if not self.is_fullscreen and self._geometry_state != (mode_key, len(time_str)):
+            self._apply_display_geometry(mode_key)
+
+        self._schedule_next_tick()
+        if finished:
+            self.on_countdown_finished()
         
     def on_countdown_finished(self):
         """倒计时结束处理"""
@@ -1260,11 +1243,9 @@ class TimerWindow(QMainWindow):
             sound_file = self.settings.get("sound_file", "")
             if sound_file:
                 # 如果是相对路径，转换为绝对路径
-                if not os.path.isabs(sound_file):
-                    base_path = self.base_path
-                    sound_file = os.path.join(base_path, sound_file)
+                sound_file = self.resolve_sound_path(sound_file)
                 
-                if os.path.exists(sound_file):
+                if self._sound_library.exists(sound_file):
                     self.play_sound(sound_file)
                 else:
                     # 如果文件不存在，播放系统提示音
@@ -1277,8 +1258,7 @@ class TimerWindow(QMainWindow):
         if action_key in ("flash", "beep_flash"):
             # 开始闪烁
             self.is_flashing = True
-            self.flash_count = 0
-            self.flash_timer.start(TimerConstants.FLASH_INTERVAL)
+            self._flash_renderer.start(self._flash_pattern())
         
         # 弹窗提示
         if self.settings.get("enable_popup", True):
@@ -1321,34 +1301,19 @@ class TimerWindow(QMainWindow):
         except Exception:
             pass
     
-    def flash_window(self):
-        """闪烁窗口"""
-        if self.is_flashing:
-            current_color = self.time_label.styleSheet()
-            if 'color: red' in current_color:
-                self.apply_settings()
-            else:
-                # 临时改为红色
-                bg_rgb = self.hex_to_rgb(self.settings["bg_color"])
-                bg_opacity = self.settings["bg_opacity"]
-                corner_radius = self.settings.get("corner_radius", 15) if self.settings.get("rounded_corners", True) else 0
-                self.time_label.setStyleSheet(f"""
-                    QLabel {{
-                        color: red;
-                        background-color: rgba({bg_rgb[0]}, {bg_rgb[1]}, {bg_rgb[2]}, {bg_opacity});
-                        border-radius: {corner_radius}px;
-                        padding: 20px 40px;
-                    }}
-                """)
-            # 停止闪烁(只闪3次)
-            self.flash_count += 1
-            if self.flash_count >= TimerConstants.FLASH_COUNT_MAX:  # 3次闪烁 = 6次状态切换
-                self.is_flashing = False
-                self.flash_count = 0
-                self.update_tray_icon()  # 闪烁结束后更新托盘图标
-        else:
-            self.flash_timer.stop()
-            self.apply_settings()
+    def _flash_pattern(self):
+        """闪烁节奏：优先使用设置中的 flash_pattern"""
+        pattern = self.settings.get("flash_pattern")
+        if pattern:
+            return pattern
+        return [TimerConstants.FLASH_INTERVAL] * TimerConstants.FLASH_COUNT_MAX
+
+    def _on_flash_finished(self):
+        """闪烁结束：恢复初始计时值并更新托盘图标"""
+        self.is_flashing = False
+        self.elapsed_seconds = self._initial_elapsed_seconds()
+        self.update_time()
+        self.update_tray_icon()
             
     def toggle_pause(self):
         """切换暂停/继续"""
@@ -1356,7 +1321,6 @@ class TimerWindow(QMainWindow):
             return
         self.is_running = not self.is_running
         if self.is_running:
-            self.pause_action.setText(self.tr('pause'))
             self.tray_icon.showMessage(
                 self.tr('app_name'),
                 self.tr('timer_continued'),
@@ -1364,7 +1328,6 @@ class TimerWindow(QMainWindow):
                 TimerConstants.TRAY_MESSAGE_DURATION
             )
         else:
-            self.pause_action.setText(self.tr('continue'))
             self.tray_icon.showMessage(
                 self.tr('app_name'),
                 self.tr('timer_paused'),
@@ -1379,14 +1342,7 @@ class TimerWindow(QMainWindow):
     
     def reset_timer(self):
         """重置计时：倒计时回到初始设置，正计时归零"""
-        mode_key = self.current_mode_key()
-        if mode_key == 'countdown':
-            hours = self.settings.get("countdown_hours", 0)
-            minutes = self.settings.get("countdown_minutes", 0)
-            seconds = self.settings.get("countdown_seconds", 0)
-            self.elapsed_seconds = hours * 3600 + minutes * 60 + seconds
-        else:
-            self.elapsed_seconds = 0
+        self.elapsed_seconds = self._initial_elapsed_seconds()
         self.is_running = False
         self.update_time()
         self.tray_icon.showMessage(
@@ -1494,12 +1450,7 @@ class TimerWindow(QMainWindow):
             self.show_tray_menu()
 
     def show_tray_menu(self) -> None:
-        self.create_tray_menu()
-        menu = getattr(self, "_tray_menu", None)
-        if menu is None:
-            return
-        self._hold_menu(menu, "_tray_menu")
-        self._exec_menu(menu, QCursor.pos())
+        self._tray_menu_model.popup(QCursor.pos())
 
     def _show_windows_toast(self, title: str, message: str, duration: int) -> bool:
         if not (self.settings.get("enable_windows_toast", True) and toaster):
@@ -1577,20 +1528,23 @@ class TimerWindow(QMainWindow):
                 self.timer.stop()
                 self.timer.deleteLater()
             
-            if hasattr(self, 'flash_timer') and self.flash_timer:
-                self.flash_timer.stop()
-                self.flash_timer.deleteLater()
+            if hasattr(self, '_flash_renderer') and self._flash_renderer:
+                self._flash_renderer.stop()
             
-            # 停止并清理媒体播放器
-            if hasattr(self, 'media_player') and self.media_player:
-                if self.media_player.playbackState() == QMediaPlayer.PlaybackState.PlayingState:
-                    self.media_player.stop()
-                self.media_player.deleteLater()
-            if hasattr(self, 'audio_output') and self.audio_output:
-                self.audio_output.deleteLater()
+            # 停止并清理铃声播放器
+            if hasattr(self, '_alarm_player') and self._alarm_player:
+                self._alarm_player.stop()
+                self._alarm_player.deleteLater()
+            if getattr(self, '_sound_library', None) is not None:
+                self._sound_library.flush()
             
-            # 保存设置（立即保存，不延迟）
-            self.save_settings(immediate=True)
+            # 保存设置（立即保存并压缩改动日志），并等待后台写入完成
+            self.save_settings(immediate=True, compact=True)
+            if not self._settings_repo.flush(timeout=3.0):
+                logger.warning("Timed out waiting for settings to be written")
+            if not self._preset_store.flush(timeout=3.0):
+                logger.warning("Timed out waiting for presets to be written")
+            self._preset_store.close()
             
             # 隐藏托盘图标
             if hasattr(self, 'tray_icon') and self.tray_icon:
@@ -1629,71 +1583,7 @@ class TimerWindow(QMainWindow):
         """右键菜单事件"""
         if event is None:
             return
-        menu = self._new_menu()
-        is_clock_mode = self.current_mode_key() == 'clock'
-        
-        # 暂停/继续
-        pause_action = QAction(self.tr('pause') if (self.is_running or is_clock_mode) else self.tr('continue'), self)
-        self._apply_action_icon(
-            pause_action,
-            FluentIcon.PAUSE if (self.is_running or is_clock_mode) else FluentIcon.PLAY,
-        )
-        pause_action.triggered.connect(self.toggle_pause)
-        pause_action.setEnabled(not is_clock_mode)
-        menu.addAction(pause_action)
-        
-        # 重置
-        reset_action = QAction(self.tr('reset'), self)
-        self._apply_action_icon(reset_action, FluentIcon.RETURN)
-        reset_action.triggered.connect(self.reset_timer)
-        menu.addAction(reset_action)
-        
-        menu.addSeparator()
-        menu.addMenu(self.build_quick_presets_menu())
-        menu.addSeparator()
-        window_menu = self._new_menu(self.tr('window_menu'))
-        window_menu.setIcon(FluentIcon.VIEW)
-
-        settings_action = QAction(self.tr('settings'), self)
-        self._apply_action_icon(settings_action, FluentIcon.SETTING)
-        settings_action.triggered.connect(self.show_settings)
-        window_menu.addAction(settings_action)
-
-        hide_action = QAction(self.tr('show_hide'), self)
-        self._apply_action_icon(
-            hide_action,
-            FluentIcon.HIDE if self.isVisible() else FluentIcon.VIEW,
-        )
-        hide_action.triggered.connect(self.toggle_visibility)
-        window_menu.addAction(hide_action)
-
-        fullscreen_text = self.tr('exit_fullscreen') if self.is_fullscreen else self.tr('enter_fullscreen')
-        fullscreen_action = QAction(fullscreen_text, self)
-        self._apply_action_icon(fullscreen_action, FluentIcon.FULL_SCREEN)
-        fullscreen_action.triggered.connect(self.toggle_fullscreen)
-        window_menu.addAction(fullscreen_action)
-
-        lock_text = self.tr('unlock_window') if self.is_locked else self.tr('lock_window')
-        lock_action = QAction(lock_text, self)
-        self._apply_action_icon(
-            lock_action,
-            FluentIcon.UNPIN if self.is_locked else FluentIcon.PIN,
-        )
-        lock_action.triggered.connect(self.toggle_lock)
-        window_menu.addAction(lock_action)
-
-        menu.addMenu(window_menu)
-        
-        menu.addSeparator()
-        
-        # 退出
-        quit_action = QAction(self.tr('quit'), self)
-        self._apply_action_icon(quit_action, FluentIcon.POWER_BUTTON)
-        quit_action.triggered.connect(self.quit_app)
-        menu.addAction(quit_action)
-        
-        self._hold_menu(menu, "_context_menu")
-        self._exec_menu(menu, event.globalPos())
+        self._context_menu_model.popup(event.globalPos())
 
     @staticmethod
     def _apply_action_icon(action: QAction, fluent_icon: FluentIcon) -> None:
@@ -1756,7 +1646,16 @@ class TimerWindow(QMainWindow):
             logger.warning("Failed to update tray icon: %s", e)
 
     def showEvent(self, a0):
-        """窗口显示时更新托盘图标"""
+        """窗口显示时补一次渲染并更新托盘图标；首次显示后安排音频后端预热"""
         event = a0
         super().showEvent(event)
+        self.update_time()
         self.update_tray_icon()
+        if not self._audio_warmup_scheduled:
+            self._audio_warmup_scheduled = True
+            QTimer.singleShot(TimerConstants.AUDIO_WARMUP_DELAY_MS, self._warm_up_audio)
+
+    def hideEvent(self, a0):
+        """窗口隐藏时停止渲染刷新"""
+        super().hideEvent(a0)
+        self._schedule_next_tick()
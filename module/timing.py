@@ -0,0 +1,89 @@
+import time
+from typing import Callable
+
+_NS_PER_SECOND = 1_000_000_000
+_NS_PER_MS = 1_000_000
+
+
+def ms_until_next_boundary(now_ms: int, period_ms: int) -> int:
+    """距离下一个 period_ms 整数倍时刻的毫秒数（恰好位于边界时返回完整周期）"""
+    return period_ms - now_ms % period_ms
+
+
+class TimerEngine:
+    """
+    基于 time.monotonic_ns() 的计时引擎
+
+    只记录锚点（开始时刻 + 当时的计时值），显示值按需计算，
+    因此刷新定时器晚到、合并或被模态对话框阻塞都不会造成累积误差。
+    """
+
+    def __init__(self, clock: Callable[[], int] = time.monotonic_ns):
+        self._clock = clock
+        self._countdown = False
+        self._base_ns = 0  # 锚点时刻的计时值（倒计时为剩余时间）
+        self._anchor_ns: int | None = None  # 运行中时的锚点时刻，暂停时为 None
+
+    @property
+    def running(self) -> bool:
+        return self._anchor_ns is not None
+
+    @property
+    def countdown(self) -> bool:
+        return self._countdown
+
+    def reset(self, seconds: int, countdown: bool) -> None:
+        """设置计时值与方向，保持当前运行状态"""
+        self._countdown = countdown
+        self._base_ns = max(0, int(seconds)) * _NS_PER_SECOND
+        if self._anchor_ns is not None:
+            self._anchor_ns = self._clock()
+
+    def start(self) -> None:
+        if self._anchor_ns is None:
+            self._anchor_ns = self._clock()
+
+    def pause(self) -> None:
+        if self._anchor_ns is not None:
+            self._base_ns = self.value_ns()
+            self._anchor_ns = None
+
+    def value_ns(self) -> int:
+        """当前计时值（纳秒）；倒计时时为剩余时间，最小为 0"""
+        if self._anchor_ns is None:
+            return self._base_ns
+        delta = self._clock() - self._anchor_ns
+        if self._countdown:
+            return max(0, self._base_ns - delta)
+        return self._base_ns + delta
+
+    def seconds(self) -> int:
+        """
+        当前显示的整秒数
+
+        倒计时向上取整（25:00 开始后要满 1 秒才显示 24:59），正计时向下取整。
+        """
+        value = self.value_ns()
+        if self._countdown:
+            return -(-value // _NS_PER_SECOND)
+        return value // _NS_PER_SECOND
+
+    def finished(self) -> bool:
+        return self._countdown and self.value_ns() == 0
+
+    def ms_until_change(self) -> int:
+        """距离显示的整秒数下一次变化的毫秒数（未运行时返回 -1）"""
+        if self._anchor_ns is None:
+            return -1
+        value = self.value_ns()
+        if self._countdown:
+            remainder = value % _NS_PER_SECOND or _NS_PER_SECOND
+        else:
+            remainder = _NS_PER_SECOND - value % _NS_PER_SECOND
+        return -(-remainder // _NS_PER_MS)
+
+    def ms_until_finished(self) -> int:
+        """距离倒计时结束的毫秒数（非运行中的倒计时返回 -1）"""
+        if self._anchor_ns is None or not self._countdown:
+            return -1
+        return -(-self.value_ns() // _NS_PER_MS)
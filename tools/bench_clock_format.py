@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+时钟格式化微基准：对比逐帧读取设置分支的旧路径与预编译格式化器
+
+用法：uv run python tools/bench_clock_format.py [--number N]
+"""
+from __future__ import annotations
+
+import itertools
+import sys
+import timeit
+from pathlib import Path
+
+root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+
+from PyQt6.QtCore import QDate, QDateTime, QTime  # noqa: E402
+
+from module.clock_format import compile_clock_formatter  # noqa: E402
+
+
+def _legacy_clock_text(settings: dict, current_time: QDateTime) -> str:
+    """旧版 update_time 中的时钟分支（逐帧读取设置并拼接格式串）"""
+    if settings.get("clock_show_date", False):
+        if settings.get("clock_format_24h", True):
+            if settings.get("clock_show_seconds", True):
+                return current_time.toString("yyyy-MM-dd HH:mm:ss")
+            return current_time.toString("yyyy-MM-dd HH:mm")
+        date_part = current_time.toString("yyyy-MM-dd")
+        time_part = current_time.toString("hh:mm:ss") if settings.get("clock_show_seconds", True) else current_time.toString("hh:mm")
+        if settings.get("clock_show_am_pm", True):
+            ampm_style = settings.get("clock_am_pm_style", "zh")
+            is_pm = current_time.time().hour() >= 12
+            indicator = ('PM' if is_pm else 'AM') if ampm_style == 'en' else ('下午' if is_pm else '上午')
+            pos = settings.get("clock_am_pm_position", "before")
+            time_with_indicator = f"{indicator} {time_part}" if pos == 'before' else f"{time_part} {indicator}"
+        else:
+            time_with_indicator = time_part
+        return f"{date_part} {time_with_indicator}"
+    if settings.get("clock_format_24h", True):
+        if settings.get("clock_show_seconds", True):
+            return current_time.toString("HH:mm:ss")
+        return current_time.toString("HH:mm")
+    base = current_time.toString("hh:mm:ss") if settings.get("clock_show_seconds", True) else current_time.toString("hh:mm")
+    if settings.get("clock_show_am_pm", True):
+        ampm_style = settings.get("clock_am_pm_style", "zh")
+        is_pm = current_time.time().hour() >= 12
+        indicator = ('PM' if is_pm else 'AM') if ampm_style == 'en' else ('下午' if is_pm else '上午')
+        pos = settings.get("clock_am_pm_position", "before")
+        return f"{indicator} {base}" if pos == 'before' else f"{base} {indicator}"
+    return base
+
+
+def _all_settings():
+    for show_date, fmt_24h, show_seconds, show_am_pm, style, position in itertools.product(
+        (False, True), (True, False), (True, False), (True, False), ("zh", "en"), ("before", "after")
+    ):
+        yield {
+            "clock_show_date": show_date,
+            "clock_format_24h": fmt_24h,
+            "clock_show_seconds": show_seconds,
+            "clock_show_am_pm": show_am_pm,
+            "clock_am_pm_style": style,
+            "clock_am_pm_position": position,
+        }
+
+
+def main() -> int:
+    number = 20000
+    if len(sys.argv) >= 3 and sys.argv[1] == "--number":
+        number = int(sys.argv[2])
+
+    samples = [
+        QDateTime(QDate(2026, 4, 3), QTime(9, 5, 7)),
+        QDateTime(QDate(2026, 4, 3), QTime(21, 45, 59)),
+    ]
+    total_legacy = 0.0
+    total_compiled = 0.0
+    for settings in _all_settings():
+        formatter = compile_clock_formatter(settings)
+        for sample in samples:
+            expected = _legacy_clock_text(settings, sample)
+            actual = formatter(sample)
+            if expected != actual:
+                print(f"[FAIL] {settings} {sample.toString()}: {expected!r} != {actual!r}")
+                return 1
+        sample = samples[1]
+        total_legacy += timeit.timeit(lambda: _legacy_clock_text(settings, sample), number=number)
+        total_compiled += timeit.timeit(lambda: formatter(sample), number=number)
+
+    combos = sum(1 for _ in _all_settings())
+    calls = combos * number
+    print(f"{combos} setting combinations x {number} calls, outputs identical")
+    print(f"legacy   : {total_legacy / calls * 1e6:.3f} us/call")
+    print(f"compiled : {total_compiled / calls * 1e6:.3f} us/call")
+    print(f"speedup  : {total_legacy / total_compiled:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+响度归一化检查：增益不大于 1，实际音量随音量设置单调变化，自带铃声对齐到目标响度
+
+对一组从很安静到很响的 WAV 计算增益，再在 0 ~ 100 的每个音量档位上
+检查实际音量严格递增（音量为 0 时为 0）；sounds/ 中自带的 Alarm01 ~ Alarm10
+应用增益后的 RMS 须在 TARGET_RMS_DB ± TOLERANCE_DB 以内。任一失败时退出码为 1。
+
+用法：uv run python tools/check_loudness.py
+"""
+from __future__ import annotations
+
+import importlib.util
+import math
+import struct
+import sys
+import tempfile
+import wave
+from pathlib import Path
+
+root = Path(__file__).resolve().parents[1]
+
+if not hasattr(math, "sumprod"):
+    sys.exit(f"check_loudness.py requires Python 3.12+ (math.sumprod), running {sys.version.split()[0]}")
+
+# 只加载 loudness.py 本身（纯标准库），不经过 module/__init__ 导入整个应用
+_spec = importlib.util.spec_from_file_location("loudness", root / "module" / "loudness.py")
+loudness = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(loudness)
+
+AMPLITUDES = (0.01, 0.05, 0.1, 0.3, 0.5, 0.9, 1.0)
+BUNDLED = [root / "sounds" / f"Alarm{i:02d}.wav" for i in range(1, 11)]
+TOLERANCE_DB = 1.0
+
+
+def _write_sine(path: Path, amplitude: float, rate: int = 8000, seconds: float = 0.5) -> None:
+    frames = int(rate * seconds)
+    samples = (int(amplitude * 32767 * math.sin(2 * math.pi * 440 * i / rate)) for i in range(frames))
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(struct.pack(f'<{frames}h', *samples))
+
+
+def main() -> int:
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for amplitude in AMPLITUDES:
+            path = Path(tmp) / f"sine_{amplitude}.wav"
+            _write_sine(path, amplitude)
+            levels = loudness.analyze_wav(str(path))
+            if levels is None:
+                failures.append(f"amplitude {amplitude}: analysis failed")
+                continue
+            gain = loudness.loudness_gain(levels[0])
+            print(f"amplitude {amplitude:<5} rms {levels[0]:7.2f} dBFS  peak {levels[1]:6.2f} dBFS  gain {gain:.3f}")
+            if not loudness.MIN_GAIN <= gain <= 1.0:
+                failures.append(f"amplitude {amplitude}: gain {gain} outside [{loudness.MIN_GAIN}, 1.0]")
+            volumes = [loudness.effective_volume(step / 100, gain) for step in range(101)]
+            if volumes[0] != 0.0:
+                failures.append(f"amplitude {amplitude}: volume 0 plays at {volumes[0]}")
+            for step in range(1, 101):
+                if not volumes[step] > volumes[step - 1]:
+                    failures.append(f"amplitude {amplitude}: volume {step}% ({volumes[step]}) "
+                                    f"not above {step - 1}% ({volumes[step - 1]})")
+                    break
+    for path in BUNDLED:
+        levels = loudness.analyze_wav(str(path))
+        if levels is None:
+            failures.append(f"{path.name}: missing or unreadable")
+            continue
+        gain = loudness.loudness_gain(levels[0])
+        played = levels[0] + 20 * math.log10(gain)
+        print(f"{path.name:<12} rms {levels[0]:7.2f} dBFS  gain {gain:.3f}  played {played:7.2f} dBFS")
+        if abs(played - loudness.TARGET_RMS_DB) > TOLERANCE_DB:
+            failures.append(f"{path.name}: plays at {played:.2f} dBFS, target {loudness.TARGET_RMS_DB} dBFS")
+    for failure in failures:
+        print("FAIL:", failure)
+    print("ok" if not failures else f"{len(failures)} failure(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
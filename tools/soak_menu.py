@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+菜单长时间运行测试：在 offscreen 平台下反复打开 / 关闭右键菜单，检查内存与 Qt 对象数量不随次数增长
+
+每次打开前切换暂停、全屏、锁定状态，并周期性地增删、移动预设，覆盖增量刷新的各条路径。
+预热后 Qt 对象数增加、Python 堆或进程常驻内存（RSS）增长超过阈值时退出码为 1。
+Qt 每次弹出菜单自身就有少量 RSS 增长（普通 QMenu 同样如此），因此先以同样次数弹出一个普通 QMenu
+作为对照，RSS 阈值为对照增长之上的余量。
+
+用法：uv run python tools/soak_menu.py [--opens N] [--presets N]
+"""
+from __future__ import annotations
+
+import argparse
+import ctypes
+import gc
+import os
+import sys
+import tracemalloc
+from pathlib import Path
+
+root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QCoreApplication, QEvent, QObject, QPoint, qInstallMessageHandler  # noqa: E402
+from PyQt6.QtWidgets import QApplication, QMenu, QWidget  # noqa: E402
+
+from module.localization import L18n  # noqa: E402
+from module.timer_menu import TimerMenu  # noqa: E402
+
+
+class _Window(QWidget):
+    """TimerMenu 用到的最小 TimerWindow 接口"""
+
+    def __init__(self, preset_count: int):
+        super().__init__()
+        self.l18n = L18n(lang_code="zh_CN")
+        self.is_running = True
+        self.is_fullscreen = False
+        self.is_locked = False
+        self.settings = {
+            "timer_mode_key": "countdown",
+            "countdown_presets": [
+                {"id": f"p{i}", "mode": "countdown", "hours": 0, "minutes": i % 60, "seconds": 0, "label": f"P{i}"}
+                for i in range(preset_count)
+            ],
+        }
+
+    def tr(self, sourceText, disambiguation=None, n=-1):
+        return self.l18n.tr(sourceText)
+
+    def current_mode_key(self):
+        return self.settings["timer_mode_key"]
+
+    def _preset_display_text(self, preset):
+        return preset["label"], f"00:{preset['minutes']:02d}:00"
+
+    @staticmethod
+    def _apply_action_icon(action, fluent_icon):
+        action.setIcon(fluent_icon.qicon())
+
+
+# 菜单动作连接的槽，测试中不需要做任何事
+for _slot in (
+    "toggle_pause",
+    "reset_timer",
+    "switch_to_count_up",
+    "prompt_custom_countdown",
+    "switch_to_clock_mode",
+    "show_settings",
+    "toggle_visibility",
+    "toggle_fullscreen",
+    "toggle_lock",
+    "quit_app",
+    "quick_countdown",
+):
+    setattr(_Window, _slot, lambda self, *args: None)
+
+
+def _quiet_offscreen(mode, context, message) -> None:
+    # offscreen 平台每次弹出菜单都会提示不支持抓取键盘 / raise()
+    if not message.startswith("This plugin does not support"):
+        sys.stderr.write(message + "\n")
+
+
+def _pump(app: QApplication) -> None:
+    app.processEvents()
+    # 被移除的预设动作通过 deleteLater 释放
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+
+
+def _qobject_count(window: QWidget) -> int:
+    return len(window.findChildren(QObject))
+
+
+def _rss_bytes() -> int | None:
+    """当前进程的常驻内存；无法读取时返回 None"""
+    if sys.platform == "win32":
+        class _Counters(ctypes.Structure):
+            _fields_ = [("cb", ctypes.c_ulong), ("PageFaultCount", ctypes.c_ulong)] + [
+                (name, ctypes.c_size_t)
+                for name in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage",
+                    "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage",
+                )
+            ]
+
+        counters = _Counters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+        return None
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _mib(value: int | None) -> str:
+    return "n/a" if value is None else f"{value / 1048576:.1f} MiB"
+
+
+def _control_rss_growth(app: QApplication, warmup: int, opens: int) -> int | None:
+    """以同样次数弹出 / 关闭一个普通 QMenu 的 RSS 增长（Qt 自身的开销）"""
+    owner = QWidget()
+    menu = QMenu(owner)
+    for i in range(10):
+        menu.addAction(f"action {i}")
+    pos = QPoint(100, 100)
+
+    def open_once() -> None:
+        menu.popup(pos)
+        menu.close()
+        _pump(app)
+
+    for _ in range(warmup):
+        open_once()
+    base = _rss_bytes()
+    for _ in range(opens):
+        open_once()
+    rss = _rss_bytes()
+    owner.deleteLater()
+    _pump(app)
+    return rss - base if rss is not None and base is not None else None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--opens", type=int, default=100_000)
+    parser.add_argument("--presets", type=int, default=50)
+    parser.add_argument("--max-growth-kb", type=int, default=512, help="预热后允许的 Python 内存增长")
+    parser.add_argument("--max-rss-growth-mb", type=float, default=4.0, help="预热后 RSS 增长允许超出普通 QMenu 对照的部分")
+    args = parser.parse_args()
+
+    qInstallMessageHandler(_quiet_offscreen)
+    app = QApplication.instance() or QApplication(sys.argv)
+    window = _Window(args.presets)
+    model = TimerMenu(window, is_tray=False)
+    pos = QPoint(100, 100)
+    warmup = max(1, args.opens // 10)
+
+    control = _control_rss_growth(app, warmup, args.opens - warmup)
+    control_mb = control / 1048576 if control is not None else 0.0
+    print(f"control: plain QMenu, {args.opens - warmup} opens after warmup: rss {control_mb:+.1f} MiB")
+
+    def open_once(i: int) -> None:
+        window.is_running = i % 2 == 0
+        window.is_fullscreen = i % 3 == 0
+        window.is_locked = i % 5 == 0
+        if i % 97 == 0:
+            presets = list(window.settings["countdown_presets"])
+            # 把末尾的预设移到开头，再删除一个、追加一个，预设总数保持不变
+            presets.insert(0, presets.pop())
+            presets.pop(len(presets) // 2)
+            presets.append({"id": f"n{i}", "mode": "countdown", "hours": 0, "minutes": 1, "seconds": 0, "label": f"N{i}"})
+            window.settings["countdown_presets"] = presets
+        model.popup(pos)
+        if model.menu is not None:
+            model.menu.close()
+        _pump(app)
+
+    for i in range(warmup):
+        open_once(i)
+    gc.collect()
+    _pump(app)
+    tracemalloc.start()
+    base_mem = tracemalloc.get_traced_memory()[0]
+    base_objects = _qobject_count(window)
+    base_rss = _rss_bytes()
+    print(f"warmup {warmup} opens: {base_objects} QObjects, rss {_mib(base_rss)}")
+
+    checkpoint = max(1, args.opens // 10)
+    for i in range(warmup, args.opens):
+        open_once(i)
+        if (i + 1) % checkpoint == 0:
+            gc.collect()
+            mem = tracemalloc.get_traced_memory()[0]
+            print(f"{i + 1:>8} opens: {_qobject_count(window)} QObjects, "
+                  f"python heap {(mem - base_mem) / 1024:+.1f} KiB, rss {_mib(_rss_bytes())}")
+
+    gc.collect()
+    _pump(app)
+    growth_kb = (tracemalloc.get_traced_memory()[0] - base_mem) / 1024
+    objects = _qobject_count(window)
+    tracemalloc.stop()
+    rss = _rss_bytes()
+    rss_growth_mb = (rss - base_rss) / 1048576 if rss is not None and base_rss is not None else 0.0
+
+    rss_limit_mb = control_mb + args.max_rss_growth_mb
+    ok = objects <= base_objects and growth_kb <= args.max_growth_kb and rss_growth_mb <= rss_limit_mb
+    print(f"{'OK' if ok else 'FAIL'}: QObjects {base_objects} -> {objects}, python heap {growth_kb:+.1f} KiB, "
+          f"rss {_mib(base_rss)} -> {_mib(rss)} ({rss_growth_mb:+.1f} MiB, limit {rss_limit_mb:+.1f} MiB)")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())